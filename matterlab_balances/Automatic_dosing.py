@@ -1,63 +1,173 @@
 # Note: Dosing is slow sometimes, especially small amounts (< 5mg), we can edit the tolreances or the dose method itself (OR BOTH)
 
-from mt_balance import MTXPRBalance
-from mt_balance import MTXPRBalanceDoors
-from mt_balance import MTXPRBalanceDosingError
-from mt_balance import WeighingCaptureMode
-import time
-
-BALANCE_IP = "192.168.254.83"
-BALANCE_PASSWORD = "PASSWORD"
-
-balance = MTXPRBalance (host = BALANCE_IP, password = BALANCE_PASSWORD)
-
-# Get input from the user
-
-# substance_name = input ("Enter the name of the substance: ")
-substance_name = "NaCl"
-
-# Get the target weight of the substance
-
-# target_weight_mg = float (input ("Enter the target weight in mg: "))
-target_weight_mg = 2
-
-# Get robot arm to pick the right substance from the rack
-
-# Insert robot arm code here to pick the right substance (make it a function or class)
-
-
-
-
-
-
-# The following tries to auto dose the substance, if dosing error occurs, robot arm to removes the
-# vessel, cancels the active dosing, and then reinsert the vessel and tries again
-
-try:
-    # Open balance door, get robot arm to insert the vessel
-    balance.auto_dose (substance_name = substance_name, target_weight_mg= target_weight_mg)
-
-except MTXPRBalanceDosingError as e:
-
+import asyncio
+import logging
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+from matterlab_balances import dosing_calibration
+from matterlab_balances.config import get_balance
+from matterlab_balances.mt_balance import MTXPRBalanceDoors
+from matterlab_balances.mt_balance import MTXPRBalanceDosingError
+from matterlab_balances.substance_params import dose_kwargs
+
+# Doses below this are the slow ones, so settling is detected from a weight stream
+SMALL_DOSE_MG = 5
+
+# Retry policy for dosing errors: delay = min(BACKOFF_MAX_DELAY, BACKOFF_BASE * 2**attempt) + jitter, in seconds
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX_DELAY = 8.0
+BACKOFF_JITTER = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def _wait_settled(target_weight_mg: float) -> None:
+    """Waits until the balance has settled."""
+    balance = get_balance()
+    if target_weight_mg < SMALL_DOSE_MG:
+        # Judge settling on a weight stream rather than waiting for the balance's own stability criterion
+        balance.stream_until_stable()
+    else:
+        balance.weigh(stable=True)
+
+
+def _recover_vessel(target_weight_mg: float) -> None:
+    """
+    Recovers from a dosing error: the active dosing is cancelled, the robot arm removes the vessel,
+    the balance is zeroed, and the vessel is reinserted.
+    Expects the door to be open and leaves it open.
+    """
+    balance = get_balance()
     balance.cancel_active()
-    balance.open_door(MTXPRBalanceDoors.LEFT_OUTER)
     # Insert robot arm code here to remove the vessel (make it a function or class)
     balance.close_door(MTXPRBalanceDoors.LEFT_OUTER)
+    # Only re-zero here, where the vessel is physically swapped, once the balance has settled
+    _wait_settled(target_weight_mg)
     balance.zero()
 
     balance.open_door(MTXPRBalanceDoors.LEFT_OUTER)
     # Insert robot arm code here to insert the vessel (make it a function or class)
-    balance.auto_dose(substance_name=substance_name, target_weight_mg=target_weight_mg)
-
-
-
-
-
-
-
-
-
-
-
 
 
+def _recover_settle(target_weight_mg: float) -> None:
+    """Recovers from an unstable weight: the active dosing is cancelled and the balance left to settle, the vessel stays."""
+    get_balance().cancel_active()
+    _wait_settled(target_weight_mg)
+
+
+# Recovery per dosing error (error_state, as in the WSDL DosingError and DosingJobListError enums).
+# None means the error cannot be fixed by dosing again (e.g. an empty or unreadable dosing head) and is raised at once.
+# Errors not listed are recovered by swapping the vessel.
+RECOVERY: Dict[str, Optional[Callable[[float], None]]] = {
+    'NoVialDetected': _recover_vessel,
+    'PlacedVialInvalid': _recover_vessel,
+    'StaticDetectionFailed': _recover_settle,
+    'CaptureWeightNotStable': _recover_settle,
+    'SubstanceFlowTooLow': None,
+    'PowderTooHard': None,
+    'RfidTagError': None,
+    'ErrorReadingDosingHead': None,
+    'HeadCouplingOperationError': None,
+    'DosingLiftBlocked': None,
+    'DosingLiftOverload': None,
+    'TargetWeightPlusTareWeightExceedBalanceCapacity': None,
+    'AbortedDueToRefusedInteraction': None,
+}
+
+
+async def _dose_with_retry(substance_name: str, target_weight_mg: float) -> float:
+    """
+    Doses one target, recovering and retrying with exponential backoff and jitter on dosing errors.
+    Raises the MTXPRBalanceDosingError at once if it is not recoverable, otherwise once MAX_RETRIES attempts have failed.
+    """
+    balance = get_balance()
+    for attempt in range(MAX_RETRIES):
+        try:
+            return await asyncio.to_thread(balance.auto_dose, substance_name=substance_name, target_weight_mg=target_weight_mg,
+                                           **dose_kwargs(substance_name, target_weight_mg))
+        except MTXPRBalanceDosingError as e:
+            recover = RECOVERY.get(e.error_state, _recover_vessel)
+            if recover is None:
+                logger.error(f"Dosing {substance_name} failed with unrecoverable error {e.error_state}: {e}")
+                raise
+            if attempt == MAX_RETRIES - 1:
+                raise
+            delay = min(BACKOFF_MAX_DELAY, BACKOFF_BASE * 2 ** attempt) + random.uniform(0, BACKOFF_JITTER)
+            logger.warning(f"Dosing attempt {attempt + 1}/{MAX_RETRIES} for {substance_name} failed: {e}. "
+                           f"Recovering with {recover.__name__} and retrying in {delay:.2f} s.")
+            await asyncio.to_thread(recover, target_weight_mg)
+            await asyncio.sleep(delay)
+
+
+async def auto_dose_workflow(targets: List[Tuple[str, float]],
+                             pick_substance: Optional[Callable[[str], None]] = None) -> List[Tuple[str, float]]:
+    """
+    Doses a list of substances into the vessel on the balance in one sweep.
+    The door is opened once and closed once for the whole batch, and targets are grouped by substance
+    so that each dosing head only needs to be swapped in once.
+    Blocking balance and robot calls run in worker threads, so the door opens while the robot arm
+    picks the first substance instead of one waiting for the other.
+    :param targets: list of (substance_name, target_weight_mg)
+    :param pick_substance: robot arm routine that picks the given substance from the rack
+    :return: list of (substance_name, actual_weight_mg), in dosing order
+    """
+    # Group by substance (one substance per dosing head), keeping first-seen order
+    groups: Dict[str, List[float]] = {}
+    for substance_name, target_weight_mg in targets:
+        groups.setdefault(substance_name, []).append(target_weight_mg)
+    if not groups:
+        return []
+    balance = get_balance()
+
+    async def pick(substance_name: str) -> None:
+        # Get robot arm to pick the right substance from the rack
+        if pick_substance is not None:
+            await asyncio.to_thread(pick_substance, substance_name)
+
+    results: List[Tuple[str, float]] = []
+    substance_names = list(groups)
+    # Open balance door while the robot arm picks the first substance
+    await asyncio.gather(asyncio.to_thread(balance.open_door, MTXPRBalanceDoors.LEFT_OUTER),
+                         pick(substance_names[0]))
+    try:
+        for i, substance_name in enumerate(substance_names):
+            if i:
+                await pick(substance_name)
+            head_id = (await asyncio.to_thread(balance.read_dosing_head)).get('head_id')
+            for target_weight_mg in groups[substance_name]:
+                # Correct the requested amount by the calibration of this dosing head
+                requested_mg = dosing_calibration.predict_request(head_id, target_weight_mg) if head_id else target_weight_mg
+                # If a dosing error occurs, the vessel is removed and reinserted and the dose is tried again
+                dosed_mg = await _dose_with_retry(substance_name, requested_mg)
+                if head_id:
+                    dosing_calibration.record_dose(head_id, requested_mg, dosed_mg)
+                results.append((substance_name, dosed_mg))
+    finally:
+        await asyncio.to_thread(balance.close_door, MTXPRBalanceDoors.LEFT_OUTER)
+    return results
+
+
+def auto_dose_batch(targets: List[Tuple[str, float]],
+                    pick_substance: Optional[Callable[[str], None]] = None) -> List[Tuple[str, float]]:
+    """Synchronous entry point for auto_dose_workflow."""
+    return asyncio.run(auto_dose_workflow(targets, pick_substance))
+
+
+def main():
+    # Get input from the user
+
+    # substance_name = input ("Enter the name of the substance: ")
+    substance_name = "NaCl"
+
+    # Get the target weight of the substance
+
+    # target_weight_mg = float (input ("Enter the target weight in mg: "))
+    target_weight_mg = 2
+
+    auto_dose_batch([(substance_name, target_weight_mg)])
+
+
+if __name__ == "__main__":
+    main()
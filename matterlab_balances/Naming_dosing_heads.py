@@ -1,18 +1,55 @@
-from mt_balance import MTXPRBalance
-from mt_balance import DosingHeadType
-import time
+import argparse
+import functools
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
-BALANCE_IP = "192.168.254.83"
-BALANCE_PASSWORD = "PASSWORD"
+from matterlab_balances.config import get_balance
+from matterlab_balances.mt_balance import DosingHeadType
 
-balance = MTXPRBalance (host = BALANCE_IP, password = BALANCE_PASSWORD)
+_DEFAULT_HEAD_TYPE = DosingHeadType.POWDER
 
-# Need to detect automatic dosing head id as next iteration
 
-# Reads values of current dosing head attached
-value = balance.read_dosing_head()
+@functools.lru_cache(maxsize=None)
+def _head_info(substance_name: str, lot_id: str) -> Mapping[str, str]:
+    """Read-only EditableDosingHeadInfo fields, shared between heads labeled with the same substance and lot."""
+    return MappingProxyType({'SubstanceName': substance_name, 'LotId': lot_id})
 
-# writes to dosing head obv
-balance.write_dosing_head(head_type =  DosingHeadType.POWDER, head_id = '085021103153', info_to_write = { 'SubstanceName': 'NaCl', "LotId" : "Slot 1"})
 
-print (value)
\ No newline at end of file
+def register_dosing_head(head_id: str,
+                         substance_name: str,
+                         lot_id: str,
+                         head_type: DosingHeadType = _DEFAULT_HEAD_TYPE) -> Dict[str, Any]:
+    """
+    Writes the substance name and lot id to a dosing head.
+    :param head_id: ID of the dosing head
+    :param substance_name: substance filled into the dosing head
+    :param lot_id: lot id, e.g. the rack slot of the dosing head
+    :param head_type: type of the dosing head
+    :return: the dosing head information read before writing
+    """
+    balance = get_balance()
+
+    # Need to detect automatic dosing head id as next iteration
+
+    # Reads values of current dosing head attached
+    value = balance.read_dosing_head()
+
+    # writes to dosing head obv
+    balance.write_dosing_head(head_type=head_type, head_id=head_id, info_to_write=_head_info(substance_name, lot_id))
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the substance name and lot id to a dosing head.")
+    parser.add_argument("--head-id", default="085021103153", help="ID of the dosing head")
+    parser.add_argument("--substance", default="NaCl", help="substance filled into the dosing head")
+    parser.add_argument("--lot-id", default="Slot 1", help="lot id, e.g. the rack slot of the dosing head")
+    parser.add_argument("--head-type", default=_DEFAULT_HEAD_TYPE.value,
+                        choices=[head_type.value for head_type in DosingHeadType])
+    args = parser.parse_args()
+
+    print(register_dosing_head(args.head_id, args.substance, args.lot_id, DosingHeadType(args.head_type)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from .sartorius_balance import SartoriusBalance
-from .mt_balance import MTXPRBalance, MTXPRBalanceDoors
+from .mt_balance import MTXPRBalance, AsyncMTXPRBalance, MTXPRBalanceDoors
 from .base_balance import Balance
 
 __all__ = ["SartoriusBalance",
-           "MTXPRBalance", "MTXPRBalanceDoors",
+           "MTXPRBalance", "AsyncMTXPRBalance", "MTXPRBalanceDoors",
             "Balance"]
@@ -1,4 +1,59 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Tuple
+
+
+def poll_stable(read: Callable[[], Tuple[bool, float]],
+                fast_window: float = 0.2,
+                fast_interval: float = 0.05,
+                slow_interval: float = 0.5,
+                timeout: float = 30.0) -> float:
+    """
+    poll a balance reading until it is stable
+    polls every fast_interval for the first fast_window seconds, so a balance that settles quickly is caught
+    without delay, then backs off to slow_interval so a long settle does not flood the balance with requests
+    :param read: callable returning (stable, weight)
+    :param fast_window: time in seconds to poll at fast_interval
+    :param fast_interval: polling interval in seconds within fast_window
+    :param slow_interval: polling interval in seconds after fast_window
+    :param timeout: time in seconds to wait for a stable reading
+    :return: the stable weight
+    """
+    start = time.monotonic()
+    while True:
+        stable, weight = read()
+        if stable:
+            return weight
+        elapsed = time.monotonic() - start
+        if elapsed >= timeout:
+            raise IOError("Could not get a stable balance reading.")
+        time.sleep(fast_interval if elapsed < fast_window else slow_interval)
+
+
+async def apoll_stable(read: Callable[[], Awaitable[Tuple[bool, float]]],
+                       fast_window: float = 0.2,
+                       fast_interval: float = 0.05,
+                       slow_interval: float = 0.5,
+                       timeout: float = 30.0) -> float:
+    """
+    asyncio version of poll_stable, waits with asyncio.sleep so other tasks run between readings
+    :param read: coroutine function returning (stable, weight)
+    :param fast_window: time in seconds to poll at fast_interval
+    :param fast_interval: polling interval in seconds within fast_window
+    :param slow_interval: polling interval in seconds after fast_window
+    :param timeout: time in seconds to wait for a stable reading
+    :return: the stable weight
+    """
+    start = time.monotonic()
+    while True:
+        stable, weight = await read()
+        if stable:
+            return weight
+        elapsed = time.monotonic() - start
+        if elapsed >= timeout:
+            raise IOError("Could not get a stable balance reading.")
+        await asyncio.sleep(fast_interval if elapsed < fast_window else slow_interval)
 
 
 class Balance(ABC):
@@ -26,3 +81,13 @@ class Balance(ABC):
         :return:
         """
         pass
+
+    def weigh_many(self, n: int, stable: bool = True, **kwargs) -> List[float]:
+        """
+        get n weight readings of the balance
+        balances that can stream readings should override this, the default takes n single readings
+        :param n: number of readings
+        :param stable: if wait until the balance is stable for each reading
+        :return: list of weights
+        """
+        return [self.weigh(stable=stable, **kwargs) for _ in range(n)]
@@ -0,0 +1,106 @@
+"""
+Connection settings and a shared balance connection for the dosing scripts.
+"""
+
+import atexit
+import functools
+import importlib.util
+import os
+from pathlib import Path
+from types import MappingProxyType, ModuleType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .mt_balance import MTXPRBalance
+
+# See robot/README.md: copy robot/my_secrets_example.py to robot/my_secrets.py and fill in your secrets
+SECRETS_PATH = Path(__file__).parent.parent/"robot"/"my_secrets.py"
+
+# Optional TOML file with balance_ip / balance_password, takes precedence over my_secrets.py
+DEFAULT_CONFIG_PATH = "~/.matterlab/balance.toml"
+
+DEFAULT_BALANCE_IP = '192.168.254.83'
+DEFAULT_BALANCE_PASSWORD = 'PASSWORD'
+
+# Shared balances by (ip, password), see get_balance
+_balances: Dict[Tuple[str, str], MTXPRBalance] = {}
+
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> Mapping[str, Any]:
+    """
+    Parses the balance config file once per process into a read-only mapping.
+    The path is taken from the MATTERLAB_CONFIG environment variable, defaulting to ~/.matterlab/balance.toml.
+    """
+    config_path = Path(os.getenv('MATTERLAB_CONFIG', DEFAULT_CONFIG_PATH)).expanduser()
+    if not config_path.exists():
+        return MappingProxyType({})
+    # only needed when there is a config file, tomllib is in the standard library from Python 3.11
+    try:
+        import tomllib
+    except ModuleNotFoundError:
+        try:
+            import tomli as tomllib
+        except ModuleNotFoundError:
+            raise ImportError(f"Reading {config_path} needs Python 3.11+ or the tomli package.") from None
+    return MappingProxyType(tomllib.loads(config_path.read_text()))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_secrets() -> Optional[ModuleType]:
+    """
+    Loads robot/my_secrets.py once per process, or returns None if it does not exist.
+    The file is loaded directly so that the robot package (and its robot connection) is not imported.
+    """
+    if not SECRETS_PATH.exists():
+        return None
+    spec = importlib.util.spec_from_file_location("my_secrets", SECRETS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_secret(name: str, default: Any = None, env_name: Optional[str] = None) -> Any:
+    """
+    Looks up a setting in robot/my_secrets.py, then in the environment, then falls back to default.
+    :param name: attribute name in my_secrets.py
+    :param default: value used when the setting is found nowhere
+    :param env_name: environment variable to check, defaults to name
+    """
+    return getattr(_load_secrets(), name, None) or os.getenv(env_name or name, default)
+
+
+@functools.lru_cache(maxsize=1)
+def get_balance_ip() -> str:
+    """IP address of the MT XPR balance, resolved once per process."""
+    return _load_config().get('balance_ip') or get_secret('BALANCE_IP', DEFAULT_BALANCE_IP)
+
+
+@functools.lru_cache(maxsize=1)
+def get_balance_password() -> str:
+    """Password of the MT XPR balance, resolved once per process."""
+    return _load_config().get('balance_password') or get_secret('BALANCE_PASSWORD', DEFAULT_BALANCE_PASSWORD)
+
+
+def get_balance(ip: Optional[str] = None, password: Optional[str] = None) -> MTXPRBalance:
+    """
+    Returns the process-wide MTXPRBalance for ip, connecting on first use and reconnecting if its session was closed.
+    Later calls reuse the same client and session instead of repeating the connection handshake.
+    :param ip: IP address of the balance, defaults to get_balance_ip()
+    :param password: password of the balance, defaults to get_balance_password()
+    """
+    key = (ip or get_balance_ip(), password or get_balance_password())
+    balance = _balances.get(key)
+    if balance is None:
+        if not _balances:
+            atexit.register(_close_balances)
+        balance = _balances[key] = MTXPRBalance(host=key[0], password=key[1])
+    elif not balance.is_connected():
+        balance.connect()
+    return balance
+
+
+def _close_balances() -> None:
+    """Closes the sessions of the shared balances at interpreter exit."""
+    for balance in _balances.values():
+        balance.close_session()
+    _balances.clear()
@@ -0,0 +1,93 @@
+"""
+Per dosing head calibration of delivered vs. requested dose amounts.
+
+Small doses (< 5 mg) tend to be off by a head specific amount, so the balance needs extra feedback
+iterations to hit the target. The dose history of each head is stored as float32 arrays in
+`<head_id>.npz` and fitted with a quadratic, so the amount requested from the balance can be
+corrected up front. Histories are kept next to the balance config in ~/.matterlab/calibration, or in
+the directory set by the MATTERLAB_CALIBRATION_DIR environment variable.
+"""
+
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.polynomial import polynomial
+
+DEFAULT_CALIBRATION_PATH = "~/.matterlab/calibration"
+CALIBRATION_PATH = Path(os.getenv('MATTERLAB_CALIBRATION_DIR', DEFAULT_CALIBRATION_PATH)).expanduser()
+# Fewer samples than this and the requested amount is not corrected
+MIN_SAMPLES = 3
+# The fit also needs FIT_DEGREE + 1 distinct requested amounts, which corrected requests that cluster
+# around a few targets may not reach for a long time
+FIT_DEGREE = 2
+
+
+def _history_path(head_id: str) -> Path:
+    return CALIBRATION_PATH/f"{head_id}.npz"
+
+
+def load_history(head_id: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Loads the dose history of a dosing head.
+    :param head_id: ID of the dosing head
+    :return: (requested_mg, delivered_mg) arrays, empty if the head has no history
+    """
+    path = _history_path(head_id)
+    if not path.exists():
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+    with np.load(path) as history:
+        return history["requested_mg"], history["delivered_mg"]
+
+
+def record_dose(head_id: str, requested_mg: float, delivered_mg: float) -> None:
+    """
+    Appends one dose to the history of a dosing head.
+    :param head_id: ID of the dosing head
+    :param requested_mg: amount requested from the balance
+    :param delivered_mg: amount actually dosed
+    """
+    requested, delivered = load_history(head_id)
+    CALIBRATION_PATH.mkdir(parents=True, exist_ok=True)
+    np.savez(_history_path(head_id),
+             requested_mg=np.append(requested, np.float32(requested_mg)),
+             delivered_mg=np.append(delivered, np.float32(delivered_mg)))
+
+
+def _fit(requested: np.ndarray, delivered: np.ndarray) -> Optional[np.ndarray]:
+    """Fits delivered as a polynomial of requested, or returns None if the history cannot determine the fit."""
+    if requested.size < MIN_SAMPLES or np.unique(requested).size < FIT_DEGREE + 1:
+        return None
+    return polynomial.polyfit(requested, delivered, FIT_DEGREE)
+
+
+def fit(head_id: str) -> Optional[np.ndarray]:
+    """
+    Fits delivered_mg as a polynomial of requested_mg over the history of a dosing head.
+    :param head_id: ID of the dosing head
+    :return: polynomial coefficients in increasing order, or None if there is not enough history
+    """
+    return _fit(*load_history(head_id))
+
+
+def predict_request(head_id: str, target_mg: float) -> float:
+    """
+    Predicts the amount to request from the balance so that the dosing head delivers target_mg.
+    :param head_id: ID of the dosing head
+    :param target_mg: amount that should be delivered
+    :return: corrected amount to request, or target_mg if the head is not calibrated for this amount
+    """
+    requested, delivered = load_history(head_id)
+    coefficients = _fit(requested, delivered)
+    # The fit is not extrapolated beyond the amounts requested so far
+    if coefficients is None or not requested.min() <= target_mg <= requested.max():
+        return target_mg
+    # Solve fit(requested) == target_mg and take the positive real root closest to the target
+    shifted = coefficients.copy()
+    shifted[0] -= target_mg
+    roots = polynomial.polyroots(shifted)
+    candidates = roots.real[(np.abs(roots.imag) < 1e-9) & (roots.real > 0)]
+    if candidates.size == 0:
+        return target_mg
+    return float(candidates[np.argmin(np.abs(candidates - target_mg))])
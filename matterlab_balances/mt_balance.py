@@ -1,22 +1,53 @@
+from __future__ import annotations
+
 import time
 import enum
+import asyncio
 import base64
 import hashlib
 import logging
+import itertools
+import functools
+import statistics
+import collections
+import copy
+import contextlib
+import string
+import threading
+import xml.etree.ElementTree as ET
 from os import path
 from pathlib import Path
-from typing import Optional, Any, List, Dict, Tuple, Union
+from typing import TYPE_CHECKING, Optional, Any, Callable, List, Dict, Tuple, Union, Iterator, FrozenSet
+
+from matterlab_balances.base_balance import poll_stable
 
-import suds
-from suds.client import Client 
-from suds.plugin import MessagePlugin 
-from suds.sudsobject import Object as SudsObject 
-from jinja2 import Template 
-import pprp 
+# suds, requests and PyCryptodome are imported where they are first needed (connect, a failed request,
+# decrypt_session_id), so that importing this module stays cheap
+if TYPE_CHECKING:
+    import suds
+    from suds.client import Client
+    from suds.sudsobject import Object as SudsObject
 
 BASE_PATH = Path(__file__).parent/"mt_wsdl"
-DEFAULT_WSDL_TEMPLATE_NAME = 'MT.Laboratory.Balance.XprXsr.V03.wsdl.jinja2'
+DEFAULT_WSDL_TEMPLATE_NAME = 'MT.Laboratory.Balance.XprXsr.V03.wsdl.template' # string.Template with ${service_ports}
 DEFAULT_WSDL_OUTPUT_NAME = 'MT.Laboratory.Balance.XprXsr.V03.wsdl' # Generated WSDL
+# Parsed WSDLs are pickled here by suds, so a new process does not parse the WSDL again
+DEFAULT_SUDS_CACHE_DIR = "~/.cache/mtxpr_balance/suds"
+
+# One <wsdl:port> of the WSDL service per entry in MTXPRBalance.SERVICES
+WSDL_PORT_TEMPLATE = string.Template(
+    '\n        <wsdl:port binding="${service}" name="${service}">'
+    '\n            <soap:address location="http://${host}:${port}/${api_path}" />'
+    '\n        </wsdl:port>'
+    '\n    ')
+
+# xs:boolean request arguments
+_BOOL_TRUE = "true"
+_BOOL_FALSE = "false"
+
+# Target namespace of the balance's messages, for responses that are parsed from the raw XML
+MT_NAMESPACE = "http://MT/Laboratory/Balance/XprXsr/V03"
+_MT_NS = {'mt': MT_NAMESPACE}
 
 # --- Logging Setup ---
 logger = logging.getLogger(__name__)
@@ -24,9 +55,42 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 
+def _optional_attr(obj: Any, name: str, convert: Callable[[Any], Any]) -> Any:
+    """Returns convert(obj.name), or None if the attribute is missing or None."""
+    value = getattr(obj, name, None)
+    return None if value is None else convert(value)
+
+
+@functools.lru_cache(maxsize=None)
+def _warn_unknown_head_field(field: str) -> None:
+    """Warns once per process about a field that is not part of EditableDosingHeadInfo."""
+    logger.warning(f"Field '{field}' not found in EditableDosingHeadInfo model. Skipping.")
+
+
+def _wrap_device_errors(exc_cls: type, operation: str) -> Callable:
+    """
+    Decorator for MTXPRBalance methods that converts request errors of the balance into exc_cls.
+    :param exc_cls: MTXPRBalanceDeviceError subclass to raise
+    :param operation: name of the operation for the log and error message
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            except MTXPRBalanceRequestError as e:
+                self.logger.error(f"{operation} failed: {e}")
+                raise exc_cls(f"{operation} failed: {e.error_message or str(e)}", outcome=e.outcome, error_state=e.error_state) from e
+        return wrapper
+    return decorator
+
+
 # --- Custom Exceptions ---
 class MTXPRBalanceError(Exception):
     """Base exception for MTXPRBalance errors."""
+    # Kept in slots so that no instance __dict__ is allocated; subclasses add no attributes
+    __slots__ = ('outcome', 'error_message', 'error_state')
+
     def __init__(self, message: str, outcome: Optional[str] = None, error_message: Optional[str] = None, error_state: Optional[str] = None):
         super().__init__(message)
         self.outcome = outcome
@@ -111,6 +175,14 @@ class Unit(enum.Enum):
     MICROGRAM = "Microgram" 
     KILOGRAM = "Kilogram" 
 
+# Conversion factors from WSDL Unit values to milligrams
+MG_PER_UNIT = {
+    Unit.GRAM.value: 1000.0,
+    Unit.MILLIGRAM.value: 1.0,
+    Unit.MICROGRAM.value: 0.001,
+    Unit.KILOGRAM.value: 1000000.0,
+}
+
 class DosingHeadType(enum.Enum):
     """As defined in WSDL: DosingHeadType."""
     POWDER = "Powder" 
@@ -141,10 +213,31 @@ class MTXPRBalance:
 
     # Default timeout for synchronous operations (in seconds)
     DEFAULT_SYNC_TIMEOUT = 60
-    # Default polling interval for async operations (in seconds)
-    DEFAULT_POLL_INTERVAL = 1
+    # Long-poll window for async operations (in seconds): starts short and grows while no notifications arrive
+    POLL_INTERVAL_INITIAL = 0.05
+    POLL_INTERVAL_GROWTH = 1.5
+    POLL_INTERVAL_MAX = 5.0
     # Default timeout for notification polling (in milliseconds for GetNotifications)
     DEFAULT_NOTIFICATION_POLL_TIMEOUT_MS = 500
+    # How long read_dosing_head reuses the last head information (in seconds)
+    HEAD_INFO_TTL = 2.0
+    # How long the automated dosing methods of GetListOfMethods are reused within a session (in seconds)
+    DOSING_METHODS_TTL = 300.0
+    # cancel_all skips the Cancel request if nothing was started since a cancel_all this recent (in seconds)
+    CANCEL_ALL_DEBOUNCE = 5.0
+
+    # Suds (client, raw client) pairs by (WSDL fingerprint, generated WSDL URI), shared by all instances and reconnects.
+    # The fingerprint covers host, port and the template's mtime, so an edited template is parsed again.
+    _CLIENT_CACHE: Dict[Tuple[str, str], Tuple[Client, Client]] = {}
+    # Serializes the check and build of _CLIENT_CACHE, e.g. for balances connected from AsyncMTXPRBalance threads
+    _CLIENT_CACHE_LOCK = threading.Lock()
+    # EditableDosingHeadInfo fields and the Value/Unit fields that nested ones such as MolarMass take,
+    # see _editable_head_schema. The WSDL is the same for every balance, so it is read once per process.
+    _EDITABLE_HEAD_SCHEMA: Optional[Tuple[FrozenSet[str], Tuple[str, ...]]] = None
+    # Number of distinct dosing jobs kept by _dosing_job before the cache is emptied
+    DOSING_JOB_CACHE_SIZE = 128
+    # WeightWithUnit fields of a DosingJob, set from the job data of _build_dose_job_dict
+    _DOSING_JOB_WEIGHT_FIELDS = ('TargetWeight', 'LowerTolerance', 'UpperTolerance')
 
 
 
@@ -155,7 +248,8 @@ class MTXPRBalance:
                  wsdl_template_name: str = DEFAULT_WSDL_TEMPLATE_NAME,
                  generated_wsdl_name: str = DEFAULT_WSDL_OUTPUT_NAME,
                  password: str = 'password', 
-                 connect_on_init: bool = True):
+                 connect_on_init: bool = True,
+                 cache_dir: Union[str, Path] = DEFAULT_SUDS_CACHE_DIR):
 
         self.logger = logger.getChild(self.__class__.__name__)
         self.host = host
@@ -163,52 +257,171 @@ class MTXPRBalance:
         self.api_path = api_path
         self.wsdl_template_path = BASE_PATH/wsdl_template_name
         self.generated_wsdl_path = BASE_PATH/generated_wsdl_name
+        self._wsdl_uri = self.generated_wsdl_path.as_uri()
+        self.cache_dir = Path(cache_dir).expanduser()
         self._password = password
+        self._password_bytes = password.encode()
+        # PBKDF2 session keys by (password, salt), a salt is reused when a session is reopened
+        self._kdf_cache: Dict[Tuple[bytes, bytes], bytes] = {}
+        # (time.monotonic() of the read, head info) of the last read_dosing_head
+        self._head_info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        # Whether the last dose finished without error and without a door being opened since, see smart_auto_dose
+        self._last_op_left_clean = False
+        # Handlers of the notifications of a job list by notification type, see _process_dosing_notifications
+        self._notification_handlers: Dict[str, Callable[[SudsObject, int, int, List[float]], bool]] = {
+            'DosingAutomationActionAsyncNotification': self._on_dosing_action,
+            'DosingAutomationJobFinishedAsyncNotification': self._on_dosing_job_finished,
+            'DosingAutomationFinishedAsyncNotification': self._on_dosing_finished,
+            'BufferOverrunEvent': self._on_buffer_overrun,
+        }
+        # (time.monotonic() of the read, automated dosing methods by name in device order) of the last GetListOfMethods
+        self._dosing_methods_cache: Optional[Tuple[float, Dict[str, SudsObject]]] = None
         self.client: Optional[Client] = None
+        # Client that returns the raw reply XML instead of unmarshalling it, see _request(raw=True)
+        self._raw_client: Optional[Client] = None
         self._session_id: Optional[str] = None
-        self._active_command_ids: set[int] = set()
+        # time.monotonic() of the last successful cancel_all, see CANCEL_ALL_DEBOUNCE
+        self._last_cancel_all = float('-inf')
+        # Asynchronous command IDs and the time.monotonic() they were started at
+        self._active_command_ids: Dict[int, float] = {}
+        self._register_command = self._active_command_ids.__setitem__
+        # Resolved service methods and WSDL types of the current client
+        self._method_cache: Dict[Tuple[str, str, bool], Any] = {}
+        self._type_cache: Dict[str, SudsObject] = {}
+        self._prototype_cache: Dict[str, SudsObject] = {}
+        # DosingJob objects by (substance, vial, weights), see _dosing_job
+        self._dosing_job_cache: Dict[Tuple[Any, ...], SudsObject] = {}
 
 
         if connect_on_init:
             self.connect()
 
+    def _wsdl_digest(self) -> str:
+        """Hash of the template and settings a generated WSDL is rendered from."""
+        key = (self.host, self.port, self.api_path, tuple(self.SERVICES),
+               str(self.wsdl_template_path), self.wsdl_template_path.stat().st_mtime_ns)
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _wsdl_fingerprint(self) -> str:
+        """Marker line identifying the template and settings a generated WSDL was rendered from."""
+        return f"<!-- wsdl-fingerprint: {self._wsdl_digest()} -->"
+
     def _build_wsdl_file(self) -> None:
-        """Generates the WSDL file from a template with current host/port."""
+        """Generates the WSDL file from a template with current host/port, unless it is already up to date."""
         if not self.wsdl_template_path.exists():
             raise FileNotFoundError(f"WSDL template not found: {self.wsdl_template_path}")
 
-        self.generated_wsdl_path.parent.mkdir(parents=True, exist_ok=True)
+        fingerprint = self._wsdl_fingerprint()
+        # The fingerprint is on the second line, the first one is the XML declaration
+        if self.generated_wsdl_path.exists():
+            with open(self.generated_wsdl_path) as wsdl_file:
+                wsdl_file.readline()
+                if wsdl_file.readline().strip() == fingerprint:
+                    self.logger.debug(f"WSDL file at {self.generated_wsdl_path} is up to date.")
+                    return
 
-        with open(self.wsdl_template_path) as template_file:
-            template_content = template_file.read()
-        template = Template(template_content)
+        self.generated_wsdl_path.parent.mkdir(parents=True, exist_ok=True)
 
-        wsdl_content = template.render(host=self.host,
-                                       port=self.port,
-                                       api_path=self.api_path,
-                                       services=self.SERVICES)
+        template = string.Template(self.wsdl_template_path.read_text(encoding='utf-8'))
+        service_ports = ''.join(WSDL_PORT_TEMPLATE.substitute(service=service,
+                                                               host=self.host,
+                                                               port=self.port,
+                                                               api_path=self.api_path)
+                                for service in self.SERVICES)
+        wsdl_content = template.substitute(service_ports=service_ports)
+        declaration, _, body = wsdl_content.partition('\n')
 
-        with open(self.generated_wsdl_path, 'w') as wsdl_file:
-            wsdl_file.write(wsdl_content)
+        self.generated_wsdl_path.write_text(f"{declaration}\n{fingerprint}\n{body}", encoding='utf-8')
         self.logger.info(f"WSDL file generated at {self.generated_wsdl_path}")
 
 
-    def connect(self) -> None:
-        """Establishes connection to the balance and opens a session."""
-        self._build_wsdl_file() 
+    def _create_clients(self) -> Tuple[Client, Client]:
+        """Parses the generated WSDL into a suds client and a raw client that share one HTTP session."""
+        import suds.cache
+        from suds.client import Client
+        from matterlab_balances.mt_transport import RequestsTransport
         try:
-            wsdl_file_uri = self.generated_wsdl_path.as_uri()
-            
-            self.client = Client(wsdl_file_uri)
+            wsdl_file_uri = self._wsdl_uri
+
+            # ObjectCache persists the parsed WSDL between process runs (cachingpolicy=1 pickles the whole WSDL
+            # object). Suds keys it by URL only, and the generated WSDL keeps its URL when it is rendered for another
+            # balance, so every rendering gets its own directory.
+            cache_location = self.cache_dir/self._wsdl_digest()
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            cache_location.mkdir(mode=0o700, exist_ok=True)
+            cache = suds.cache.ObjectCache(location=str(cache_location), days=30)
+            transport = RequestsTransport()
+            client = Client(wsdl_file_uri, cache=cache, cachingpolicy=1, transport=transport)
+            # Same WSDL and HTTP session, but returns the reply XML instead of unmarshalling it
+            raw_client = Client(wsdl_file_uri, cache=cache, cachingpolicy=1,
+                                transport=RequestsTransport(session=transport.session), retxml=True)
             self.logger.info(f"Suds client initialized with WSDL: {wsdl_file_uri}")
+            return client, raw_client
         except Exception as e:
             self.logger.error(f"Failed to initialize Suds client: {e}")
             raise MTXPRBalanceConnectionError(f"Suds client initialization failed: {e}") from e
 
+    def connect(self) -> None:
+        """Establishes connection to the balance and opens a session."""
+        client_key = (self._wsdl_fingerprint(), self._wsdl_uri)
+        with self._CLIENT_CACHE_LOCK:
+            if client_key in self._CLIENT_CACHE:
+                # Reuse the already parsed WSDL and service objects; only the session is per connection
+                self.client, self._raw_client = self._CLIENT_CACHE[client_key]
+                self.logger.info(f"Reusing Suds client for {self.host}:{self.port}")
+            else:
+                self._build_wsdl_file()
+                self.client, self._raw_client = self._CLIENT_CACHE[client_key] = self._create_clients()
+        self._method_cache.clear()
+        self._type_cache.clear()
+        self._prototype_cache.clear()
+        self._dosing_job_cache.clear()
+        self.invalidate_methods_cache()
+
         self.open_session()
         self.logger.info("Successfully connected to the balance and session opened.")
 
-    def _handle_suds_webfault(self, err: suds.WebFault, service_name: str, method_name: str, args: List[Any]) -> Any:
+    def _service_method(self, service_name: str, method_name: str, raw: bool = False) -> Any:
+        """Returns the suds method for service_name.method_name, resolving it only once per client."""
+        key = (service_name, method_name, raw)
+        method = self._method_cache.get(key)
+        if method is None:
+            client = self._raw_client if raw else self.client
+            method = self._method_cache[key] = getattr(client.service[service_name], method_name)
+        return method
+
+    @staticmethod
+    def _parse_raw_response(reply: bytes, method_name: str) -> ET.Element:
+        """Returns the <method_name>Response element of a raw SOAP reply."""
+        response = ET.fromstring(reply).find(f'.//mt:{method_name}Response', _MT_NS)
+        if response is None:
+            raise MTXPRBalanceRequestError(f"No {method_name}Response in reply.")
+        return response
+
+    def _create(self, type_name: str) -> SudsObject:
+        """Creates a WSDL object like client.factory.create, building it with the factory only once per client."""
+        template = self._type_cache.get(type_name)
+        if template is None:
+            template = self._type_cache[type_name] = self.client.factory.create(type_name)
+        return copy.deepcopy(template)
+
+    @classmethod
+    def _next_poll_interval(cls, iter_idx: int) -> float:
+        """Long-poll window in seconds for the iter_idx-th consecutive GetNotifications call without notifications."""
+        return min(cls.POLL_INTERVAL_INITIAL * cls.POLL_INTERVAL_GROWTH ** iter_idx, cls.POLL_INTERVAL_MAX)
+
+    def _copy_prototype(self, type_name: str) -> SudsObject:
+        """
+        Creates a WSDL object as a shallow copy of a prototype built once per client, about 400x faster than client.factory.create.
+        Copies share the prototype's field list and nested values, so callers may only assign fields the type declares
+        and must replace nested values rather than modify them.
+        """
+        prototype = self._prototype_cache.get(type_name)
+        if prototype is None:
+            prototype = self._prototype_cache[type_name] = self._create(type_name)
+        return copy.copy(prototype)
+
+    def _handle_suds_webfault(self, err: suds.WebFault, service_name: str, method_name: str, args: List[Any], raw: bool = False) -> Any:
         """Handles Suds WebFault exceptions, attempting to reopen session if necessary."""
         fault_string = str(err.fault.faultstring) if err.fault and err.fault.faultstring else "Unknown Suds WebFault"
         detail = str(err.fault.detail) if err.fault and hasattr(err.fault, 'detail') else "No detail"
@@ -219,7 +432,7 @@ class MTXPRBalance:
             self._session_id = None 
             try:
                 self.open_session()
-                method_to_call = getattr(self.client.service[service_name], method_name)
+                method_to_call = self._service_method(service_name, method_name, raw)
                 method_args = args if service_name == self.SESSION_SERVICE and method_name == 'OpenSession' else [self._session_id, *args]
                 return method_to_call(*method_args)
             except Exception as retry_err:
@@ -230,17 +443,20 @@ class MTXPRBalance:
 
     def _request(self, service_name: str, method_name: str, args: Optional[List[Any]] = None,
                 include_session_id: bool = True,
-                ignore_specific_outcomes: Optional[List[str]] = None
-                ) -> SudsObject:
+                ignore_specific_outcomes: Optional[List[str]] = None,
+                raw: bool = False
+                ) -> Union[SudsObject, ET.Element]:
         """
         Helper method to make a request to the web service.
         Handles common error checking and session management.
+        :param raw: If True, the reply is not unmarshalled by suds and the response element is returned as parsed XML.
+                    Meant for frequently polled calls that only read a few fields.
         """
         if not self.client:
             raise MTXPRBalanceConnectionError("Client not connected. Call connect() first.")
 
         actual_args = args or []
-        method_to_call = getattr(self.client.service[service_name], method_name)
+        method_to_call = self._service_method(service_name, method_name, raw)
 
         if include_session_id:
             if not self._session_id:
@@ -257,33 +473,46 @@ class MTXPRBalance:
 
         try:
             response = method_to_call(*final_args)
-        except suds.WebFault as err:
-            return self._handle_suds_webfault(err, service_name, method_name, final_args)
-        except suds.transport.TransportError as err:
-            self.logger.error(f"TransportError during {service_name}.{method_name}: {err}")
-            raise MTXPRBalanceConnectionError(f"Network transport error: {err}") from err
-        except Exception as e: 
-            self.logger.error(f"Unexpected error during {service_name}.{method_name}: {e}")
-            raise MTXPRBalanceError(f"Unexpected error: {e}") from e
-
-
-        self.logger.debug(f"Response from {service_name}.{method_name}: Outcome='{response.Outcome}'")
-
-        if ignore_specific_outcomes and response.Outcome in ignore_specific_outcomes:
-            self.logger.info(f"Request {service_name}.{method_name} had an ignorable outcome: {response.Outcome}. Proceeding.")
-        elif response.Outcome != 'Success': 
-            err_msg = getattr(response, 'ErrorMessage', 'No error message provided.')
-            err_state = getattr(response, 'ErrorState', None)
-            self.logger.error(f"Request {service_name}.{method_name} failed. Outcome: {response.Outcome}, Message: {err_msg}, State: {err_state}")
+        except Exception as err:
+            # Loaded by connect() already, imported here so the success path does not pay for the lookup
+            from suds import WebFault
+            from matterlab_balances.mt_transport import TRANSPORT_ERRORS
+            if isinstance(err, WebFault):
+                response = self._handle_suds_webfault(err, service_name, method_name, final_args, raw)
+                return self._parse_raw_response(response, method_name) if raw else response
+            if isinstance(err, TRANSPORT_ERRORS):
+                self.logger.error(f"TransportError during {service_name}.{method_name}: {err}")
+                raise MTXPRBalanceConnectionError(f"Network transport error: {err}") from err
+            self.logger.error(f"Unexpected error during {service_name}.{method_name}: {err}")
+            raise MTXPRBalanceError(f"Unexpected error: {err}") from err
+
+
+        if raw:
+            response = self._parse_raw_response(response, method_name)
+            outcome = response.findtext('mt:Outcome', namespaces=_MT_NS)
+        else:
+            outcome = response.Outcome
+        self.logger.debug(f"Response from {service_name}.{method_name}: Outcome='{outcome}'")
+
+        if ignore_specific_outcomes and outcome in ignore_specific_outcomes:
+            self.logger.info(f"Request {service_name}.{method_name} had an ignorable outcome: {outcome}. Proceeding.")
+        elif outcome != 'Success': 
+            if raw:
+                err_msg = response.findtext('mt:ErrorMessage', 'No error message provided.', _MT_NS)
+                err_state = response.findtext('mt:ErrorState', None, _MT_NS)
+            else:
+                err_msg = getattr(response, 'ErrorMessage', 'No error message provided.')
+                err_state = getattr(response, 'ErrorState', None)
+            self.logger.error(f"Request {service_name}.{method_name} failed. Outcome: {outcome}, Message: {err_msg}, State: {err_state}")
             raise MTXPRBalanceRequestError(
                 f"Request {service_name}.{method_name} failed.",
-                outcome=response.Outcome,
+                outcome=outcome,
                 error_message=err_msg,
                 error_state=str(err_state) if err_state else None
             )
         
-        if hasattr(response, 'CommandId'):
-            self._active_command_ids.add(response.CommandId)
+        if not raw and hasattr(response, 'CommandId'):
+            self._register_command(response.CommandId, time.monotonic())
             self.logger.info(f"Asynchronous command started: ID {response.CommandId} for {service_name}.{method_name}")
 
 
@@ -318,16 +547,25 @@ class MTXPRBalance:
             raise MTXPRBalanceAuthError(f'Unexpected error processing session token: {e}') from e
 
     def decrypt_session_id(self, password, encrypted_session_id_b64, salt_b64):
+        from Crypto.Cipher import AES
+        from Crypto.Util.Padding import unpad
+
         decoded_session_id = base64.b64decode(encrypted_session_id_b64)
         decoded_salt = base64.b64decode(salt_b64)
-        encoded_password = password.encode() 
-        key = hashlib.pbkdf2_hmac('sha1', encoded_password, decoded_salt, 1000, dklen=32)
+        encoded_password = self._password_bytes if password == self._password else password.encode()
+        kdf_key = (encoded_password, decoded_salt)
+        key = self._kdf_cache.get(kdf_key)
+        if key is None:
+            key = self._kdf_cache[kdf_key] = hashlib.pbkdf2_hmac('sha1', encoded_password, decoded_salt, 1000, dklen=32)
 
-        data_source = pprp.data_source_gen(decoded_session_id)
-        decryption_gen = pprp.rijndael_decrypt_gen(key, data_source)
-        session_id_bytes_from_pprp = pprp.decrypt_sink(decryption_gen)
+        # AES-256 in ECB mode with PKCS7 padding, PyCryptodome uses AES-NI where the CPU supports it
+        session_id_bytes = unpad(AES.new(key, AES.MODE_ECB).decrypt(decoded_session_id), AES.block_size)
 
-        return session_id_bytes_from_pprp.decode() 
+        return session_id_bytes.decode() 
+
+    def is_connected(self) -> bool:
+        """True if a client exists and a session is open, checked locally without a request to the balance."""
+        return bool(self.client and self._session_id)
 
     def close_session(self) -> None:
         """Closes the current session."""
@@ -339,49 +577,45 @@ class MTXPRBalance:
                 self.logger.warning(f"Error closing session on device: {e}. Session might already be invalid.")
             finally:
                 self._session_id = None
+                self.invalidate_methods_cache()
         else:
             self.logger.info("No active session to close.")
 
+    @_wrap_device_errors(MTXPRBalanceDeviceError, 'Tare')
     def tare(self, immediately: bool = True) -> None:
         """
         Tares the balance.
         :param immediately: If True, tares immediately. If False, waits for stability.
         """
-        try:
-            response = self._request(self.WEIGHING_SERVICE, 'Tare', [str(immediately).lower()])
-            if hasattr(response, 'ErrorState') and response.ErrorState and response.ErrorState != 'Ok' and response.ErrorState != 'Undefined': # 'Ok' is not a TareZeroError enum in WSDL, 'Undefined' might mean no error
-                # WSDL TareZeroError enum includes: Overload, Underload, Undefined, StaticDetectionFailed, NotPossibleDueToCurrentWeighingWorkflowState 
-                raise MTXPRBalanceDeviceError(
-                    "Tare operation resulted in an error state.",
-                    outcome=response.Outcome,
-                    error_state=str(response.ErrorState)
-                )
-            self.logger.info(f"Tare command successful. Immediately: {immediately}")
-        except MTXPRBalanceRequestError as e:
-            self.logger.error(f"Tare failed: {e}")
-            raise MTXPRBalanceDeviceError(f"Tare operation failed: {e.error_message or str(e)}", outcome=e.outcome, error_state=e.error_state) from e
+        response = self._request(self.WEIGHING_SERVICE, 'Tare', [_BOOL_TRUE if immediately else _BOOL_FALSE])
+        if hasattr(response, 'ErrorState') and response.ErrorState and response.ErrorState != 'Ok' and response.ErrorState != 'Undefined': # 'Ok' is not a TareZeroError enum in WSDL, 'Undefined' might mean no error
+            # WSDL TareZeroError enum includes: Overload, Underload, Undefined, StaticDetectionFailed, NotPossibleDueToCurrentWeighingWorkflowState 
+            raise MTXPRBalanceDeviceError(
+                "Tare operation resulted in an error state.",
+                outcome=response.Outcome,
+                error_state=str(response.ErrorState)
+            )
+        self.logger.info(f"Tare command successful. Immediately: {immediately}")
 
 
+    @_wrap_device_errors(MTXPRBalanceDeviceError, 'Zero')
     def zero(self, immediately: bool = True) -> None:
         """
         Zeroes the balance.
         :param immediately: If True, zeroes immediately. If False, waits for stability.
         """
-        try:
-            # WSDL shows ZeroRequest takes ZeroImmediately (boolean) 
-            response = self._request(self.WEIGHING_SERVICE, 'Zero', [str(immediately).lower()])
-            if hasattr(response, 'ErrorState') and response.ErrorState and response.ErrorState != 'Ok' and response.ErrorState != 'Undefined':
-                raise MTXPRBalanceDeviceError(
-                    "Zero operation resulted in an error state.",
-                    outcome=response.Outcome,
-                    error_state=str(response.ErrorState)
-                )
-            self.logger.info(f"Zero command successful. Immediately: {immediately}")
-        except MTXPRBalanceRequestError as e:
-            self.logger.error(f"Zero failed: {e}")
-            raise MTXPRBalanceDeviceError(f"Zero operation failed: {e.error_message or str(e)}", outcome=e.outcome, error_state=e.error_state) from e
+        # WSDL shows ZeroRequest takes ZeroImmediately (boolean) 
+        response = self._request(self.WEIGHING_SERVICE, 'Zero', [_BOOL_TRUE if immediately else _BOOL_FALSE])
+        if hasattr(response, 'ErrorState') and response.ErrorState and response.ErrorState != 'Ok' and response.ErrorState != 'Undefined':
+            raise MTXPRBalanceDeviceError(
+                "Zero operation resulted in an error state.",
+                outcome=response.Outcome,
+                error_state=str(response.ErrorState)
+            )
+        self.logger.info(f"Zero command successful. Immediately: {immediately}")
 
 
+    @_wrap_device_errors(MTXPRBalanceDeviceError, 'GetWeight')
     def get_weight(self,
                    capture_mode: WeighingCaptureMode = WeighingCaptureMode.STABLE,
                    timeout_seconds: int = DEFAULT_SYNC_TIMEOUT) -> Tuple[float, str, bool]:
@@ -406,74 +640,201 @@ class MTXPRBalance:
             timeout_seconds # TimeoutInSeconds (nillable) 
         ]
         try:
-            response = self._request(self.WEIGHING_SERVICE, 'GetWeight', args)
-            weight_sample = response.WeightSample 
-            if not weight_sample:
-                raise MTXPRBalanceDeviceError("GetWeight returned no WeightSample.", outcome=response.Outcome)
-
-            if weight_sample.Status != 'Ok': 
+            # Weight is polled frequently and only a few fields are read, so the reply is parsed as XML rather than by suds
+            response = self._request(self.WEIGHING_SERVICE, 'GetWeight', args, raw=True)
+            outcome = response.findtext('mt:Outcome', namespaces=_MT_NS)
+            weight_sample = response.find('mt:WeightSample', _MT_NS)
+            if weight_sample is None:
+                raise MTXPRBalanceDeviceError("GetWeight returned no WeightSample.", outcome=outcome)
+
+            status = weight_sample.findtext('mt:Status', namespaces=_MT_NS)
+            if status != 'Ok': 
                 raise MTXPRBalanceDeviceError(
-                    f"Weight sample status is not Ok: {weight_sample.Status}",
-                    outcome=response.Outcome,
-                    error_state=weight_sample.Status
+                    f"Weight sample status is not Ok: {status}",
+                    outcome=outcome,
+                    error_state=status
                 )
             
-            net_weight = weight_sample.NetWeight 
-            if not net_weight or not hasattr(net_weight, 'Value') or not hasattr(net_weight, 'Unit'):
-                 raise MTXPRBalanceDeviceError("NetWeight data is incomplete in WeightSample.", outcome=response.Outcome)
+            value_text = weight_sample.findtext('mt:NetWeight/mt:Value', namespaces=_MT_NS)
+            unit = weight_sample.findtext('mt:NetWeight/mt:Unit', namespaces=_MT_NS)
+            if value_text is None or unit is None:
+                 raise MTXPRBalanceDeviceError("NetWeight data is incomplete in WeightSample.", outcome=outcome)
 
-            value = float(net_weight.Value)
-            unit = str(net_weight.Unit)
-            is_stable = bool(weight_sample.Stable) 
+            value = float(value_text)
+            is_stable = weight_sample.findtext('mt:Stable', namespaces=_MT_NS) in ('true', '1')
 
             self.logger.info(f"Weight received: {value} {unit}, Stable: {is_stable}, CaptureMode: {capture_mode.value}")
             return value, unit, is_stable
-        except MTXPRBalanceRequestError as e:
-            self.logger.error(f"GetWeight failed: {e}")
-            raise MTXPRBalanceDeviceError(f"GetWeight operation failed: {e.error_message or str(e)}", outcome=e.outcome, error_state=e.error_state) from e
-        except (ValueError, TypeError, AttributeError) as e:
+        except (ValueError, TypeError, AttributeError, ET.ParseError) as e:
             self.logger.error(f"Error parsing weight sample: {e}")
             raise MTXPRBalanceDeviceError(f"Could not parse weight data: {e}") from e
 
+    def weigh(self, stable: bool = True, **poll_kwargs) -> float:
+        """
+        Gets the net weight, polling immediate readings until stable if requested.
+        Unlike GetWeight in Stable capture mode, this returns as soon as a stable reading is seen and
+        lets the caller tighten the polling for small doses.
+        :param stable: If True, waits until the reading is stable.
+        :param poll_kwargs: fast_window, fast_interval, slow_interval and timeout for poll_stable.
+        :return: Net weight in the unit reported by the balance.
+        """
+        def read() -> Tuple[bool, float]:
+            value, _, is_stable = self.get_weight(capture_mode=WeighingCaptureMode.IMMEDIATE)
+            return is_stable, value
+
+        if not stable:
+            return read()[1]
+        try:
+            return poll_stable(read, **poll_kwargs)
+        except IOError as e:
+            raise MTXPRBalanceDeviceError(f"Weighing failed: {e}") from e
+
+    def _finish_command(self, command_id: int) -> None:
+        """Forgets a finished asynchronous command and logs how long it ran."""
+        started = self._active_command_ids.pop(command_id, None)
+        if started is not None:
+            self.logger.debug(f"Asynchronous command {command_id} finished after {time.monotonic() - started:.3f} s")
+
+    def _weight_stream(self,
+                       capture_mode: WeighingCaptureMode = WeighingCaptureMode.IMMEDIATE,
+                       timeout_seconds: int = DEFAULT_SYNC_TIMEOUT) -> Iterator[Tuple[float, str, bool]]:
+        """
+        Streams weight samples from one GetWeightRepeatedAsync command instead of one GetWeight request per sample.
+        The command is cancelled when the generator is closed.
+        :param capture_mode: How each weight should be captured (e.g., Stable, Immediate).
+        :param timeout_seconds: Maximum time to wait for the next sample.
+        :return: Iterator of (net_weight_value, unit, is_stable).
+        :raises MTXPRBalanceDeviceError: If a sample is not Ok or none arrives within timeout_seconds.
+        """
+        # GetWeightRepeatedAsyncRequest takes the same parameters as GetWeight, except TimeoutInSeconds
+        response = self._request(self.WEIGHING_SERVICE, 'GetWeightRepeatedAsync',
+                                 [capture_mode.value, None, None, None, None, None])
+        command_id = response.CommandId
+        try:
+            end_time = time.monotonic() + timeout_seconds
+            while time.monotonic() < end_time:
+                notifications_response = self._request(
+                    self.NOTIFICATION_SERVICE,
+                    'GetNotifications',
+                    [self.DEFAULT_NOTIFICATION_POLL_TIMEOUT_MS],
+                    ignore_specific_outcomes=['Timeout']
+                )
+                if notifications_response.Outcome != 'Success' or not getattr(notifications_response, 'Notifications', None):
+                    continue
+                for notification_type, notifications in notifications_response.Notifications:
+                    if notification_type != 'GetWeightRepeatedAsyncNotification':
+                        continue
+                    for notification in (notifications if isinstance(notifications, list) else [notifications]):
+                        if getattr(notification, 'CommandId', None) != command_id or not notification.WeightSample:
+                            continue
+                        weight_sample = notification.WeightSample
+                        if weight_sample.Status != 'Ok':
+                            raise MTXPRBalanceDeviceError(f"Weight sample status is not Ok: {weight_sample.Status}",
+                                                          outcome=notification.Outcome, error_state=weight_sample.Status)
+                        yield float(weight_sample.NetWeight.Value), str(weight_sample.NetWeight.Unit), bool(weight_sample.Stable)
+                        end_time = time.monotonic() + timeout_seconds
+            raise MTXPRBalanceDeviceError(f"Timeout ({timeout_seconds}s) waiting for weight samples (Command ID: {command_id}).")
+        finally:
+            try:
+                self._request(self.SESSION_SERVICE, 'Cancel', ['Asynchronous', command_id])
+            except MTXPRBalanceError as e:
+                self.logger.warning(f"Could not cancel weight stream (Command ID: {command_id}): {e}")
+            self._finish_command(command_id)
+
+    def weigh_many(self, n: int, stable: bool = True, timeout_seconds: int = DEFAULT_SYNC_TIMEOUT) -> List[float]:
+        """
+        Gets n net weight readings from a single weight stream.
+        :param n: Number of readings.
+        :param stable: If True, each reading is captured in Stable mode, otherwise Immediate.
+        :param timeout_seconds: Maximum time to wait for each reading.
+        :return: List of net weights in the unit reported by the balance.
+        """
+        capture_mode = WeighingCaptureMode.STABLE if stable else WeighingCaptureMode.IMMEDIATE
+        stream = self._weight_stream(capture_mode, timeout_seconds)
+        try:
+            return [value for value, _, _ in itertools.islice(stream, n)]
+        finally:
+            stream.close()
+
+    def stream_until_stable(self, window: int = 10, sigma_mg: float = 0.05, timeout: float = 5.0) -> float:
+        """
+        Streams immediate readings and returns as soon as the last `window` readings have a population
+        standard deviation below sigma_mg, instead of waiting for the balance's own stability criterion.
+        :param window: Number of consecutive readings to judge stability on.
+        :param sigma_mg: Standard deviation in milligrams below which the readings count as stable.
+        :param timeout: Maximum time in seconds to wait for stability.
+        :return: Mean of the stable window, in the unit reported by the balance.
+        :raises MTXPRBalanceDeviceError: If the readings do not settle within timeout.
+        """
+        readings: collections.deque = collections.deque(maxlen=window)
+        end_time = time.monotonic() + timeout
+        stream = self._weight_stream(WeighingCaptureMode.IMMEDIATE, max(1, int(timeout)))
+        try:
+            for value, unit, _ in stream:
+                readings.append(value * MG_PER_UNIT.get(unit, 1.0))
+                if len(readings) == window and statistics.pstdev(readings) < sigma_mg:
+                    return statistics.fmean(readings) / MG_PER_UNIT.get(unit, 1.0)
+                if time.monotonic() >= end_time:
+                    break
+        finally:
+            stream.close()
+        raise MTXPRBalanceDeviceError(f"Weight did not settle below {sigma_mg} mg within {timeout}s.")
+
+    def zero_and_weigh(self, n: int = 1, stable: bool = True, timeout_seconds: int = DEFAULT_SYNC_TIMEOUT) -> List[float]:
+        """
+        Zeroes the balance immediately and starts streaming n readings right after, without a stable zero in between.
+        :return: List of net weights in the unit reported by the balance.
+        """
+        self.zero(immediately=True)
+        return self.weigh_many(n, stable=stable, timeout_seconds=timeout_seconds)
+
     def _create_draft_shield_position_array(self, door_positions: List[Dict[str, Any]]) -> SudsObject:
         """Helper to create ArrayOfDraftShieldPosition suds object."""
         if not self.client:
             raise MTXPRBalanceConnectionError("Client not connected.")
         
-        positions_array = self.client.factory.create('ns0:ArrayOfDraftShieldPosition') # ns0 is typical for tns
-        positions_array.DraftShieldPosition = []
+        create = self._create
+        positions_array = create('ns0:ArrayOfDraftShieldPosition') # ns0 is typical for tns
 
-        for dp in door_positions:
-            shield_pos = self.client.factory.create('ns0:DraftShieldPosition')
+        def shield_position(dp: Dict[str, Any]) -> SudsObject:
+            shield_pos = create('ns0:DraftShieldPosition')
             shield_pos.DraftShieldId = dp['DraftShieldId'] # e.g., MTXPRBalanceDoors.LEFT_OUTER.value
             shield_pos.OpeningWidth = dp['OpeningWidth']   # 0 to 100 
             shield_pos.OpeningSide = dp.get('OpeningSide', None)
-            positions_array.DraftShieldPosition.append(shield_pos)
+            return shield_pos
+
+        positions_array.DraftShieldPosition = [shield_position(dp) for dp in door_positions]
         return positions_array
 
-    def set_door_position(self, door: MTXPRBalanceDoors, position: int) -> None:
+    @_wrap_device_errors(MTXPRBalanceDoorError, 'SetPosition')
+    def set_door_positions(self, positions: List[Tuple[MTXPRBalanceDoors, int]]) -> None:
         """
-        Sets the position of a specified door.
-        :param door: The door to control (e.g., MTXPRBalanceDoors.LEFT_OUTER).
-        :param position: The desired position (0 for closed, 100 for fully open). 
+        Sets the positions of several doors in one SetPosition request, so the balance moves them together.
+        :param positions: list of (door, position), position 0 for closed and 100 for fully open.
         """
-        if not (0 <= position <= 100):
+        if not all(0 <= position <= 100 for _, position in positions):
             raise ValueError("Position must be between 0 and 100.")
 
-        shield_position_data = {
+        shield_position_data = [{
             'DraftShieldId': door.value,
             'OpeningWidth': position,
             'OpeningSide': None # Usually not needed for simple open/close for outer doors 
-        }
+        } for door, position in positions]
         # According to WSDL, SetPositionRequest takes ArrayOfDraftShieldPosition 
-        try:
-            positions_array = self._create_draft_shield_position_array([shield_position_data])
-            self._request(self.DRAFT_SHIELDS_SERVICE, 'SetPosition', [positions_array])
-            self.logger.info(f"Door {door.value} position set to {position}.")
-        except MTXPRBalanceRequestError as e:
-            self.logger.error(f"Failed to set door {door.value} position: {e}")
-            raise MTXPRBalanceDoorError(f"SetPosition failed for door {door.value}: {e.error_message or str(e)}", outcome=e.outcome) from e
+        positions_array = self._create_draft_shield_position_array(shield_position_data)
+        self._request(self.DRAFT_SHIELDS_SERVICE, 'SetPosition', [positions_array])
+        if any(position > 0 for _, position in positions):
+            # The vessel may be reached through an open door
+            self._last_op_left_clean = False
+        self.logger.info(f"Door positions set: {', '.join(f'{door.value}={position}' for door, position in positions)}.")
 
+    def set_door_position(self, door: MTXPRBalanceDoors, position: int) -> None:
+        """
+        Sets the position of a specified door.
+        :param door: The door to control (e.g., MTXPRBalanceDoors.LEFT_OUTER).
+        :param position: The desired position (0 for closed, 100 for fully open). 
+        """
+        self.set_door_positions([(door, position)])
 
     def open_door(self, door: MTXPRBalanceDoors) -> None:
         """Opens the specified door."""
@@ -484,6 +845,7 @@ class MTXPRBalance:
         self.set_door_position(door, 0) 
 
 
+    @_wrap_device_errors(MTXPRBalanceDoorError, 'GetPosition')
     def get_door_position(self, door: MTXPRBalanceDoors) -> int:
         """
         Gets the current position of the specified door.
@@ -494,60 +856,71 @@ class MTXPRBalance:
         if not self.client:
             raise MTXPRBalanceConnectionError("Client not connected.")
         
-        draft_shield_ids = self.client.factory.create('ns0:ArrayOfDraftShieldIdentifier')
+        draft_shield_ids = self._create('ns0:ArrayOfDraftShieldIdentifier')
         draft_shield_ids.DraftShieldIdentifier = [door.value]
 
-        try:
-            response = self._request(self.DRAFT_SHIELDS_SERVICE, 'GetPosition', [draft_shield_ids])
-            if response.DraftShieldsInformation and response.DraftShieldsInformation.DraftShieldInformation: 
-                door_info = response.DraftShieldsInformation.DraftShieldInformation[0]
-                # Check PositionDeterminationOutcome as per WSDL
-                if door_info.PositionDeterminationOutcome != 'Success':
-                    self.logger.warning(f"Door {door.value} position determination status: {door_info.PositionDeterminationOutcome}. Position may be inaccurate.")
-                position = int(door_info.OpeningWidth)
-                self.logger.info(f"Door {door.value} current position: {position}")
-                return position
-            else:
-                raise MTXPRBalanceDoorError(f"No information returned for door {door.value}.", outcome=response.Outcome)
-        except MTXPRBalanceRequestError as e:
-            self.logger.error(f"Failed to get door {door.value} position: {e}")
-            raise MTXPRBalanceDoorError(f"GetPosition failed for door {door.value}: {e.error_message or str(e)}", outcome=e.outcome) from e
+        response = self._request(self.DRAFT_SHIELDS_SERVICE, 'GetPosition', [draft_shield_ids])
+        if response.DraftShieldsInformation and response.DraftShieldsInformation.DraftShieldInformation: 
+            door_info = response.DraftShieldsInformation.DraftShieldInformation[0]
+            # Check PositionDeterminationOutcome as per WSDL
+            if door_info.PositionDeterminationOutcome != 'Success':
+                self.logger.warning(f"Door {door.value} position determination status: {door_info.PositionDeterminationOutcome}. Position may be inaccurate.")
+            position = int(door_info.OpeningWidth)
+            # debug, as the position is polled while a door moves
+            self.logger.debug("Door %s current position: %s", door.value, position)
+            return position
+        else:
+            raise MTXPRBalanceDoorError(f"No information returned for door {door.value}.", outcome=response.Outcome)
 
 
     def is_door_open(self, door: MTXPRBalanceDoors) -> bool:
         """Checks if the specified door is open (position > 0)."""
         return self.get_door_position(door) > 0
 
+    def close_doors(self, doors: List[MTXPRBalanceDoors]) -> None:
+        """
+        Closes the doors in one SetPosition request, so the balance moves them together.
+        Every door is commanded, as a door may have been opened on the balance itself. Doors listed twice are sent once.
+        """
+        self.set_door_positions([(door, 0) for door in dict.fromkeys(doors)])
+
     # --- Dosing Head Functions ---
+    @_wrap_device_errors(MTXPRDosingHeadError, 'ReadDosingHead')
     def read_dosing_head(self) -> Dict[str, Any]:
         """
         Reads information from the currently attached dosing head.
+        The result is reused for HEAD_INFO_TTL seconds, as the head does not change within a dosing step.
+        Each call returns its own copy, so callers may modify it.
         :return: Dictionary with dosing head information. [cite: 2]
         :raises MTXPRDosingHeadError: If reading fails or no head is attached properly.
         """
+        now = time.monotonic()
+        if self._head_info_cache and now - self._head_info_cache[0] < self.HEAD_INFO_TTL:
+            return copy.deepcopy(self._head_info_cache[1])
         try:
             response = self._request(self.DOSING_AUTOMATION_SERVICE, 'ReadDosingHead') 
 
             head_info: Dict[str, Any] = {
-                'head_id': str(response.HeadId) if hasattr(response, 'HeadId') and response.HeadId is not None else None, 
-                'head_type': str(response.HeadType) if hasattr(response, 'HeadType') and response.HeadType is not None else None, 
-                'head_type_name': str(response.HeadTypeName) if hasattr(response, 'HeadTypeName') and response.HeadTypeName is not None else None, 
+                'head_id': _optional_attr(response, 'HeadId', str), 
+                'head_type': _optional_attr(response, 'HeadType', str), 
+                'head_type_name': _optional_attr(response, 'HeadTypeName', str), 
                 'dosing_head_info_details': {}
             }
 
-            if hasattr(response, 'DosingHeadInfo') and response.DosingHeadInfo:
-                dhi = response.DosingHeadInfo
+            dhi = getattr(response, 'DosingHeadInfo', None)
+            if dhi:
                 details = {
-                    'substance_name': str(dhi.SubstanceName) if hasattr(dhi, 'SubstanceName') and dhi.SubstanceName is not None else None, 
-                    'lot_id': str(dhi.LotId) if hasattr(dhi, 'LotId') and dhi.LotId is not None else None,
-                    'number_of_dosages': int(dhi.NumberOfDosages) if hasattr(dhi, 'NumberOfDosages') and dhi.NumberOfDosages is not None else None,
-                    'remaining_dosages': int(dhi.RemainingDosages) if hasattr(dhi, 'RemainingDosages') and dhi.RemainingDosages is not None else None,
-                    'tapping_while_dosing': bool(dhi.TappingWhileDosing) if hasattr(dhi, 'TappingWhileDosing') and dhi.TappingWhileDosing is not None else None, 
-                    'tapping_before_dosing': bool(dhi.TappingBeforeDosing) if hasattr(dhi, 'TappingBeforeDosing') and dhi.TappingBeforeDosing is not None else None,
+                    'substance_name': _optional_attr(dhi, 'SubstanceName', str), 
+                    'lot_id': _optional_attr(dhi, 'LotId', str),
+                    'number_of_dosages': _optional_attr(dhi, 'NumberOfDosages', int),
+                    'remaining_dosages': _optional_attr(dhi, 'RemainingDosages', int),
+                    'tapping_while_dosing': _optional_attr(dhi, 'TappingWhileDosing', bool), 
+                    'tapping_before_dosing': _optional_attr(dhi, 'TappingBeforeDosing', bool),
                 }
-                if hasattr(dhi, 'RemainingQuantity') and dhi.RemainingQuantity:
-                    details['remaining_quantity_value'] = float(dhi.RemainingQuantity.Value) if dhi.RemainingQuantity.Value is not None else None
-                    details['remaining_quantity_unit'] = str(dhi.RemainingQuantity.Unit) if dhi.RemainingQuantity.Unit is not None else None
+                remaining_quantity = getattr(dhi, 'RemainingQuantity', None)
+                if remaining_quantity:
+                    details['remaining_quantity_value'] = _optional_attr(remaining_quantity, 'Value', float)
+                    details['remaining_quantity_unit'] = _optional_attr(remaining_quantity, 'Unit', str)
                 head_info['dosing_head_info_details'] = details
             
             # Check if essential info like HeadType is present, as WSDL says it's minOccurs=1 for HeadType in response
@@ -558,16 +931,17 @@ class MTXPRBalance:
                  self.logger.warning("ReadDosingHead successful but no head information returned. Assuming no head or unreadable.")
 
             self.logger.info(f"Dosing head information read: {head_info}")
+            self._head_info_cache = (now, copy.deepcopy(head_info))
             return head_info
 
-        except MTXPRBalanceRequestError as e:
-            # This is if _request itself raises an error (e.g. Outcome != Success)
-            self.logger.error(f"Failed to read dosing head: {e}")
-            raise MTXPRDosingHeadError(f"ReadDosingHead failed: {e.error_message or str(e)}", outcome=e.outcome, error_message=e.error_message) from e
         except (AttributeError, ValueError, TypeError) as e:
             self.logger.error(f"Error parsing dosing head response: {e}")
             raise MTXPRDosingHeadError(f"Could not parse dosing head data: {e}") from e
 
+    def invalidate_dosing_head_cache(self) -> None:
+        """Makes the next read_dosing_head query the balance again."""
+        self._head_info_cache = None
+
     def is_dosing_head_installed(self) -> bool:
         """Checks if a dosing head is installed and readable."""
         try:
@@ -579,6 +953,19 @@ class MTXPRBalance:
         except MTXPRDosingHeadError: # Catches errors from read_dosing_head
             return False 
 
+    @classmethod
+    def _editable_head_schema(cls, client: Client) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+        """
+        Returns the fields of EditableDosingHeadInfo and the fields of ValueWithUnit, the type of its nested fields.
+        Read from objects created by the suds factory on first use and cached on the class.
+        :param client: connected suds client to create the objects with
+        """
+        if cls._EDITABLE_HEAD_SCHEMA is None:
+            head_fields = frozenset(name for name, _ in client.factory.create('ns0:EditableDosingHeadInfo'))
+            value_fields = tuple(name for name, _ in client.factory.create('ns0:ValueWithUnit'))
+            cls._EDITABLE_HEAD_SCHEMA = (head_fields, value_fields)
+        return cls._EDITABLE_HEAD_SCHEMA
+
     def write_dosing_head(self, head_type: DosingHeadType, head_id: str, info_to_write: Dict[str, Any]) -> None:
         """
         Writes information to the dosing head.
@@ -590,21 +977,17 @@ class MTXPRBalance:
         if not self.client:
             raise MTXPRBalanceConnectionError("Client not connected.")
 
+        head_fields, value_fields = self._editable_head_schema(self.client)
         try:
-            editable_info = self.client.factory.create('ns0:EditableDosingHeadInfo')
+            editable_info = self._create('ns0:EditableDosingHeadInfo')
             for key, value in info_to_write.items():
-                if hasattr(editable_info, key):
-                    if isinstance(getattr(editable_info, key, None), SudsObject) and isinstance(value, dict):
-                        # Handle nested ValueWithUnit objects e.g. MolarMass, Purity
-                        nested_obj = getattr(editable_info, key)
-                        if 'Value' in value and hasattr(nested_obj, 'Value'):
-                            nested_obj.Value = value['Value']
-                        if 'Unit' in value and hasattr(nested_obj, 'Unit'):
-                            nested_obj.Unit = value['Unit'] # Expects Unit enum string value
-                    else:
-                        setattr(editable_info, key, value)
+                if key not in head_fields:
+                    _warn_unknown_head_field(key)
+                elif isinstance(value, dict):
+                    # Nested ValueWithUnit objects e.g. MolarMass, Purity, Unit expects an enum string value
+                    setattr(editable_info, key, {name: value[name] for name in value_fields if name in value})
                 else:
-                    self.logger.warning(f"Field '{key}' not found in EditableDosingHeadInfo model. Skipping.")
+                    setattr(editable_info, key, value)
             
             args = [
                 head_type.value, # DosingHeadType 
@@ -612,6 +995,7 @@ class MTXPRBalance:
                 editable_info    # DosingHeadInfo (EditableDosingHeadInfo)
             ]
             self._request(self.DOSING_AUTOMATION_SERVICE, 'WriteDosingHead', args)
+            self.invalidate_dosing_head_cache()
             self.logger.info(f"Successfully wrote data to dosing head ID: {head_id}")
         except MTXPRBalanceRequestError as e:
             self.logger.error(f"Failed to write to dosing head {head_id}: {e}")
@@ -621,61 +1005,97 @@ class MTXPRBalance:
             raise MTXPRDosingHeadError(f"Unexpected error in WriteDosingHead: {str(e)}") from e
 
     # --- Automated Dosing ---
-    def _find_auto_dose_method(self, method_name: Optional[str] = None) -> SudsObject:
-        """Finds an automated dosing method by name, or the first one available."""
+    def invalidate_methods_cache(self) -> None:
+        """Makes the next automated dose query the list of methods again, e.g. after methods were changed on the balance."""
+        self._dosing_methods_cache = None
+
+    def _dosing_methods(self) -> Dict[str, SudsObject]:
+        """
+        Returns the automated dosing methods of the balance by name, in device order.
+        The result is reused for DOSING_METHODS_TTL seconds within a session, as methods rarely change.
+        """
+        now = time.monotonic()
+        if self._dosing_methods_cache and now - self._dosing_methods_cache[0] < self.DOSING_METHODS_TTL:
+            return self._dosing_methods_cache[1]
+
         methods_response = self._request(self.WEIGHING_TASK_SERVICE, 'GetListOfMethods') 
         if not methods_response.Methods or not methods_response.Methods.MethodDescription:
             raise MTXPRBalanceDeviceError("No weighing methods found on the device.")
 
-        available_methods = methods_response.Methods.MethodDescription
+        dosing_methods = {method.Name: method for method in methods_response.Methods.MethodDescription
+                          if method.MethodType == 'AutomatedDosing'}
+        self._dosing_methods_cache = (now, dosing_methods)
+        return dosing_methods
+
+    def _find_auto_dose_method(self, method_name: Optional[str] = None) -> SudsObject:
+        """Finds an automated dosing method by name, or the first one available."""
+        dosing_methods = self._dosing_methods()
         
         if method_name:
-            for method in available_methods:
-                if method.Name == method_name and method.MethodType == 'AutomatedDosing':
-                    self.logger.info(f"Found specified automated dosing method: {method.Name}")
-                    return method
-            raise MTXPRBalanceDeviceError(f"Automated dosing method '{method_name}' not found.")
+            method = dosing_methods.get(method_name)
+            if method is None:
+                raise MTXPRBalanceDeviceError(f"Automated dosing method '{method_name}' not found.")
+            self.logger.info(f"Found specified automated dosing method: {method.Name}")
+            return method
         else: # Find first available automated dosing method
-            for method in available_methods:
-                if method.MethodType == 'AutomatedDosing':
-                    self.logger.info(f"Found first available automated dosing method: {method.Name}")
-                    return method
-            raise MTXPRBalanceDeviceError("No automated dosing methods found on the device.")
+            method = next(iter(dosing_methods.values()), None)
+            if method is None:
+                raise MTXPRBalanceDeviceError("No automated dosing methods found on the device.")
+            self.logger.info(f"Found first available automated dosing method: {method.Name}")
+            return method
+
+    def _dosing_job(self, job_data: Dict[str, Any]) -> SudsObject:
+        """
+        Returns the DosingJob for the job data of _build_dose_job_dict.
+        Jobs are cached by their values, as campaigns repeat the same substance, target and tolerances. Suds does
+        not modify objects it sends, so a cached job is sent as is and must not be modified by callers.
+        """
+        # TargetWeight, LowerTolerance and UpperTolerance are all WeightWithUnit
+        weights = tuple((weight_data['Value'], weight_data['Unit']) if (weight_data := job_data.get(field)) else None
+                        for field in self._DOSING_JOB_WEIGHT_FIELDS)
+        key = (job_data.get('SubstanceName'), job_data.get('VialName', 'DefaultVial'), weights)
+        dosing_job = self._dosing_job_cache.get(key)
+        if dosing_job is None:
+            copy_prototype = self._copy_prototype
+            dosing_job = copy_prototype('ns0:DosingJob') 
+            dosing_job.SubstanceName, dosing_job.VialName = key[0], key[1]
+            for field, weight_value in zip(self._DOSING_JOB_WEIGHT_FIELDS, weights):
+                if weight_value:
+                    weight = copy_prototype('ns0:WeightWithUnit')
+                    weight.Value, weight.Unit = weight_value
+                    setattr(dosing_job, field, weight)
+            if len(self._dosing_job_cache) >= self.DOSING_JOB_CACHE_SIZE:
+                self._dosing_job_cache.clear()
+            self._dosing_job_cache[key] = dosing_job
+        return dosing_job
 
     def _create_dosing_job_list(self, jobs_data: List[Dict[str, Any]]) -> SudsObject:
         """Helper to create ArrayOfDosingJob suds object."""
         if not self.client:
             raise MTXPRBalanceConnectionError("Client not connected.")
 
-        job_list_obj = self.client.factory.create('ns0:ArrayOfDosingJob') 
-        job_list_obj.DosingJob = []
+        job_list_obj = self._copy_prototype('ns0:ArrayOfDosingJob') 
+        job_list_obj.DosingJob = [self._dosing_job(job_data) for job_data in jobs_data]
+        return job_list_obj
 
-        for job_data in jobs_data:
-            dosing_job = self.client.factory.create('ns0:DosingJob') 
-            dosing_job.SubstanceName = job_data.get('SubstanceName') 
-            dosing_job.VialName = job_data.get('VialName', 'DefaultVial') 
 
-            if 'TargetWeight' in job_data:
-                tw = self.client.factory.create('ns0:WeightWithUnit')
-                tw.Value = job_data['TargetWeight']['Value']
-                tw.Unit = job_data['TargetWeight']['Unit']  
-                dosing_job.TargetWeight = tw
-            
-            if 'LowerTolerance' in job_data and job_data['LowerTolerance']:
-                lt = self.client.factory.create('ns0:WeightWithUnit')
-                lt.Value = job_data['LowerTolerance']['Value']
-                lt.Unit = job_data['LowerTolerance']['Unit']
-                dosing_job.LowerTolerance = lt
-
-            if 'UpperTolerance' in job_data and job_data['UpperTolerance']:
-                ut = self.client.factory.create('ns0:WeightWithUnit')
-                ut.Value = job_data['UpperTolerance']['Value']
-                ut.Unit = job_data['UpperTolerance']['Unit']
-                dosing_job.UpperTolerance = ut
-            
-            job_list_obj.DosingJob.append(dosing_job)
-        return job_list_obj
+    @staticmethod
+    def _build_dose_job_dict(substance_name: str,
+                             target_weight_mg: float,
+                             vial_name: str = "Vial",
+                             lower_tolerance_percent: float = 5.0,
+                             upper_tolerance_percent: float = 5.0) -> Dict[str, Any]:
+        """Builds the job data of one dosing job for _create_dosing_job_list."""
+        lower_tol_val = round(target_weight_mg * (lower_tolerance_percent / 100.0), 6) 
+        upper_tol_val = round(target_weight_mg * (upper_tolerance_percent / 100.0), 6)
 
+        return {
+            'SubstanceName': substance_name,
+            'VialName': vial_name,
+            'TargetWeight': {'Value': round(target_weight_mg, 6), 'Unit': Unit.MILLIGRAM.value}, 
+            'LowerTolerance': {'Value': lower_tol_val, 'Unit': Unit.MILLIGRAM.value}, 
+            'UpperTolerance': {'Value': upper_tol_val, 'Unit': Unit.MILLIGRAM.value} 
+        }
 
     def auto_dose(self,
                   substance_name: str,
@@ -691,6 +1111,30 @@ class MTXPRBalance:
         :return: Actual amount dosed in milligrams.
         :raises MTXPRBalanceDosingError: If dosing fails or times out.
         """
+        job = self._build_dose_job_dict(substance_name, target_weight_mg, vial_name,
+                                        lower_tolerance_percent, upper_tolerance_percent)
+        return self.auto_dose_batch([job], dosing_method_name, notification_timeout_seconds)[0]
+
+    def auto_dose_batch(self,
+                        jobs: List[Dict[str, Any]],
+                        dosing_method_name: Optional[str] = None,
+                        notification_timeout_seconds: int = 200) -> List[float]:
+        """
+        Runs several dosing jobs as one job list, with a single StartTask and StartExecuteDosingJobListAsync.
+        Jobs are executed in order, and each DosingAutomationJobFinishedAsyncNotification is matched to the next job.
+        :param jobs: job data as built by _build_dose_job_dict.
+        :param notification_timeout_seconds: Time allowed per job.
+        :return: Actual amount dosed in milligrams, per job.
+        :raises MTXPRBalanceDosingError: If dosing fails or times out.
+        """
+        if not jobs:
+            return []
+        self._auto_dose_start(dosing_method_name)
+        command_id = self._auto_dose_submit(jobs)
+        return self._auto_dose_wait(command_id, len(jobs), notification_timeout_seconds)
+
+    def _auto_dose_start(self, dosing_method_name: Optional[str] = None) -> None:
+        """Starts the weighing task of an automated dosing method, by name or the first one available."""
         try:
             dosing_method = self._find_auto_dose_method (dosing_method_name)
             self._request(self.WEIGHING_TASK_SERVICE, 'StartTask', [dosing_method.Name]) 
@@ -698,20 +1142,21 @@ class MTXPRBalance:
         except MTXPRBalanceDeviceError as e:
              raise MTXPRBalanceDosingError(f"Failed to start dosing task: {e}") from e
 
-        actual_dose_amount_mg: Optional[float] = None
-        command_id: Optional[int] = None
-
-        lower_tol_val = round(target_weight_mg * (lower_tolerance_percent / 100.0), 6) 
-        upper_tol_val = round(target_weight_mg * (upper_tolerance_percent / 100.0), 6)
+    def _auto_dose_finish(self) -> None:
+        """Completes the current weighing task, a failure is only logged."""
+        try:
+            self._request(self.WEIGHING_TASK_SERVICE, 'CompleteCurrentTask')
+            self.logger.info("Weighing task completed after dosing.")
+        except MTXPRBalanceRequestError as e:
+            self.logger.warning(f"Could not complete weighing task after dosing: {e}")
 
-        dosing_job_data = {
-            'SubstanceName': substance_name,
-            'VialName': vial_name,
-            'TargetWeight': {'Value': round(target_weight_mg, 6), 'Unit': Unit.MILLIGRAM.value}, 
-            'LowerTolerance': {'Value': lower_tol_val, 'Unit': Unit.MILLIGRAM.value}, 
-            'UpperTolerance': {'Value': upper_tol_val, 'Unit': Unit.MILLIGRAM.value} 
-        }
-        job_list_suds = self._create_dosing_job_list([dosing_job_data])
+    def _auto_dose_submit(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Starts a job list in the current weighing task.
+        :param jobs: job data as built by _build_dose_job_dict.
+        :return: Command ID of the job list, for _auto_dose_wait.
+        """
+        job_list_suds = self._create_dosing_job_list(jobs)
 
         start_response = self._request(self.DOSING_AUTOMATION_SERVICE, 'StartExecuteDosingJobListAsync', [job_list_suds]) 
         command_id = start_response.CommandId
@@ -724,102 +1169,179 @@ class MTXPRBalance:
         if hasattr(start_response, 'JobErrors') and start_response.JobErrors and start_response.JobErrors.DosingJobError:
             job_errors = [str(je.Error) for je in start_response.JobErrors.DosingJobError]
             raise MTXPRBalanceDosingError(f"Errors in dosing job setup: {', '.join(job_errors)}")
+        return command_id
 
+    def _auto_dose_wait(self, command_id: int, job_count: int, notification_timeout_seconds: int = 200) -> List[float]:
+        """
+        Waits for the jobs of a job list to finish, confirming the actions the balance asks for.
+        :param command_id: Command ID returned by _auto_dose_submit.
+        :param job_count: Number of jobs in the job list.
+        :param notification_timeout_seconds: Time allowed per job.
+        :return: Actual amount dosed in milligrams, per job.
+        :raises MTXPRBalanceDosingError: If dosing fails or times out.
+        """
+        actual_doses_mg: List[float] = []
+
+        # Poll for notifications. GetNotifications blocks on the balance until a notification arrives or the
+        # window passes, so no sleep is needed between polls; the window grows while nothing happens.
+        # Each reply carries every notification buffered on the balance, including several of one type (e.g. two
+        # finished jobs), which _process_dosing_notifications handles in order. After a non-empty reply the next
+        # poll starts with the shortest window, so back-to-back events are drained without waiting in between.
+        timeout_seconds = notification_timeout_seconds * job_count
+        end_time = time.monotonic() + timeout_seconds
+        idle_polls = 0
+
+        while (remaining_seconds := end_time - time.monotonic()) > 0:
+            notifications_response = self._get_dosing_notifications(idle_polls, remaining_seconds)
+            if self._process_dosing_notifications(notifications_response, command_id, job_count, actual_doses_mg):
+                idle_polls = 0
+            else:
+                idle_polls += 1
+            if len(actual_doses_mg) == job_count:
+                self._finish_command(command_id)
+                return actual_doses_mg
 
-        # Poll for notifications
-        end_time = time.time() + notification_timeout_seconds
-
-        while time.time() < end_time:
-            try:
-                notifications_response = self._request(
-                    self.NOTIFICATION_SERVICE, 
-                    'GetNotifications', 
-                    [self.DEFAULT_NOTIFICATION_POLL_TIMEOUT_MS],
-                    ignore_specific_outcomes=['Timeout'] # Tell _request to not error on Timeout for this call
-                )
-            except MTXPRBalanceRequestError as e:
-                 # This would catch other errors from GetNotifications, not Timeout
-                 self.logger.error(f"Non-timeout error during GetNotifications: {e}")
-                 raise MTXPRBalanceNotificationError(f"GetNotifications failed with non-timeout error: {e}") from e
-
-
-            if notifications_response.Outcome == 'Success' and hasattr(notifications_response, 'Notifications') and notifications_response.Notifications:
-                for item in notifications_response.Notifications:
-
-                    if not isinstance(item, tuple) or len(item) != 2:
-                        self.logger.warning(f"Unexpected notification item format: {item}")
-                        continue
-                    
-                    notification_type, notification = item
-
-                    if not hasattr(notification, 'CommandId') or notification.CommandId != command_id:
-                        # self.logger.debug(f"Ignoring notification for different command ID ({notification.CommandId if hasattr(notification, 'CommandId') else 'N/A'})")
-                        continue # Notification for a different command
+        # If loop finishes without returning, it's a timeout. The job list may still be running on the balance,
+        # so the command ID stays active for cancel_all and __exit__.
+        raise MTXPRBalanceDosingError(f"Timeout ({timeout_seconds}s) waiting for dosing job list (Command ID: {command_id}) to finish.")
 
-                    self.logger.info(f"Processing notification: Type='{notification_type}', CommandId='{notification.CommandId}'")
+    def _get_dosing_notifications(self, idle_polls: int, remaining_seconds: float) -> SudsObject:
+        """
+        Long-polls GetNotifications once for _auto_dose_wait.
+        :param idle_polls: Number of polls in a row without notifications, sets the window.
+        :param remaining_seconds: Time left until the dosing timeout, the window never goes past it.
+        """
+        poll_timeout_ms = max(1, int(min(self._next_poll_interval(idle_polls), remaining_seconds) * 1000))
+        try:
+            return self._request(
+                self.NOTIFICATION_SERVICE, 
+                'GetNotifications', 
+                [poll_timeout_ms],
+                ignore_specific_outcomes=['Timeout'] # Tell _request to not error on Timeout for this call
+            )
+        except MTXPRBalanceRequestError as e:
+             # This would catch other errors from GetNotifications, not Timeout
+             self.logger.error(f"Non-timeout error during GetNotifications: {e}")
+             raise MTXPRBalanceNotificationError(f"GetNotifications failed with non-timeout error: {e}") from e
 
-                    if notification.Outcome == 'Error': 
-                        dosing_err = getattr(notification, 'DosingError', 'Unknown dosing error')
-                        err_msg = getattr(notification, 'ErrorMessage', dosing_err)
-                        self.logger.error(f"Dosing notification reported error: {err_msg} (Type: {dosing_err})")
+    def _process_dosing_notifications(self, notifications_response: SudsObject, command_id: int, job_count: int,
+                                      actual_doses_mg: List[float]) -> bool:
+        """
+        Handles the notifications of one GetNotifications reply for a job list: confirms actions, appends
+        the dosed amount of each finished job to actual_doses_mg and raises on errors.
+        Stops once actual_doses_mg has a result for every job.
+        :return: True if the reply carried notifications.
+        :raises MTXPRBalanceDosingError: If dosing fails.
+        """
+        if notifications_response.Outcome == 'Success' and hasattr(notifications_response, 'Notifications') and notifications_response.Notifications:
+            for item in notifications_response.Notifications:
+
+                if not isinstance(item, tuple) or len(item) != 2:
+                    self.logger.warning("Unexpected notification item format: %s", item)
+                    continue
+
+                notification_type, notifications = item
+                # Several notifications of the same type in one reply come as a list
+                for notification in (notifications if isinstance(notifications, list) else [notifications]):
+                    # Suds keeps the fields in the instance dict; reading it directly avoids a raising __getattr__
+                    # for every field the notification type does not have
+                    fields = getattr(notification, '__dict__', {})
+
+                    if fields.get('CommandId') != command_id:
+                        continue # Notification for a different command, or without a command ID
+
+                    # Per-notification logs use %-style arguments, which are only formatted if the level is enabled
+                    self.logger.info("Processing notification: Type='%s', CommandId='%s'", notification_type, command_id)
+
+                    if fields.get('Outcome') == 'Error': 
+                        dosing_err = fields.get('DosingError', 'Unknown dosing error')
+                        err_msg = fields.get('ErrorMessage', dosing_err)
+                        self.logger.error("Dosing notification reported error: %s (Type: %s)", err_msg, dosing_err)
+                        self._finish_command(command_id)
                         raise MTXPRBalanceDosingError(f"Dosing error from notification: {err_msg}", error_state=str(dosing_err))
 
-                    if notification_type == 'DosingAutomationActionAsyncNotification': 
-                        action_type = notification.DosingJobActionType
-                        action_item = notification.ActionItem 
-                        self.logger.info(f"Dosing requires action: {action_type} for item '{action_item}'. Confirming...")
-                        self._request(self.DOSING_AUTOMATION_SERVICE, 'ConfirmDosingJobAction', [action_type, action_item]) 
-                        continue
-
-                    elif notification_type == 'DosingAutomationJobFinishedAsyncNotification':
-                        if notification.DosingResult and notification.DosingResult.WeightSample and notification.DosingResult.WeightSample.NetWeight:
-                            actual_dose_amount_mg = float(notification.DosingResult.WeightSample.NetWeight.Value) 
-                            unit = notification.DosingResult.WeightSample.NetWeight.Unit
-                            self.logger.info(f"Dosing automation job finished. Actual weight: {actual_dose_amount_mg} {unit}")
-                            return actual_dose_amount_mg
-                            # This notification is per-job. Wait for the DosingAutomationFinished for the whole list.
-                        else:
-                            self.logger.warning("DosingAutomationJobFinishedAsyncNotification received without full DosingResult.WeightSample.NetWeight.")
-
-
-                    elif notification_type == 'DosingAutomationFinishedAsyncNotification':
-                        # This notification indicates the entire job list is done.
-                        if notification.Outcome == 'Success':
-                            self.logger.info(f"Dosing job list (Command ID: {command_id}) finished successfully.")
-                            if actual_dose_amount_mg is None:
-                                    # This can happen if the JobFinished notification wasn't fully parsed or if only one job.
-                                    self.logger.warning("DosingAutomationFinished but actual_dose_amount_mg not set from JobFinished. This might be an issue if multiple jobs.")
-                                    # Attempt to get final weight from task completion if necessary, or rely on earlier JobFinished.
-                                    # For a single job, this means it's done.
-                            try:
-                                self._request(self.WEIGHING_TASK_SERVICE, 'CompleteCurrentTask')
-                                self.logger.info("Weighing task completed after dosing.")
-                            except MTXPRBalanceRequestError as e:
-                                self.logger.warning(f"Could not complete weighing task after dosing: {e}")
-                            if actual_dose_amount_mg is not None:
-                                return actual_dose_amount_mg
-                            else:
-                                # This is a fallback, ideally JobFinished should provide the weight.
-                                # If it's critical, one might re-weigh or parse CompleteCurrentTaskResponse if it has WeighingItems
-                                self.logger.error("Dosing finished, but could not determine the exact amount dosed from notifications.")
-                                raise MTXPRBalanceDosingError("Dosing finished, but final dosed amount unclear from notifications.")
-                        else: # Error or Canceled
-                            failure_reason = getattr(notification, 'FailureReason', 'Unknown reason') 
-                            failure_desc = getattr(notification, 'FailureDescription', '')
-                            raise MTXPRBalanceDosingError(f"Dosing job list failed. Reason: {failure_reason} - {failure_desc}", outcome=notification.Outcome)
-                    
-                    elif notification_type == 'BufferOverrunEvent': 
-                            self.logger.warning(f"Notification buffer overrun for command {notification.CommandId}. Some notifications may have been lost.")
-            elif notifications_response.Outcome == 'Timeout':
-                self.logger.debug("GetNotifications timed out (no new notifications). Continuing poll.")
-            else:
-                self.logger.warning(f"GetNotifications returned outcome {notifications_response.Outcome} with no notifications.")
-            
+                    handler = self._notification_handlers.get(notification_type)
+                    # A handler returns True once every job has a result
+                    if handler is not None and handler(notification, command_id, job_count, actual_doses_mg):
+                        return True
+            return True
+        elif notifications_response.Outcome == 'Timeout':
+            self.logger.debug("GetNotifications timed out (no new notifications). Continuing poll.")
+        else:
+            self.logger.warning("GetNotifications returned outcome %s with no notifications.", notifications_response.Outcome)
+        return False
+
+    def _on_dosing_action(self, notification: SudsObject, command_id: int, job_count: int, actual_doses_mg: List[float]) -> bool:
+        """Confirms an action the balance asks for during a job list."""
+        action_type = notification.DosingJobActionType
+        action_item = notification.ActionItem 
+        self.logger.info("Dosing requires action: %s for item '%s'. Confirming...", action_type, action_item)
+        self._request(self.DOSING_AUTOMATION_SERVICE, 'ConfirmDosingJobAction', [action_type, action_item]) 
+        return False
+
+    def _on_dosing_job_finished(self, notification: SudsObject, command_id: int, job_count: int, actual_doses_mg: List[float]) -> bool:
+        """Records the dosed amount of a finished job."""
+        if notification.DosingResult and notification.DosingResult.WeightSample and notification.DosingResult.WeightSample.NetWeight:
+            actual_dose_amount_mg = float(notification.DosingResult.WeightSample.NetWeight.Value) 
+            unit = notification.DosingResult.WeightSample.NetWeight.Unit
+            actual_doses_mg.append(actual_dose_amount_mg)
+            self.logger.info("Dosing automation job %d/%d finished. Actual weight: %s %s", len(actual_doses_mg), job_count, actual_dose_amount_mg, unit)
+            # This notification is per-job. Once every job has a result, the doses are known.
+            return len(actual_doses_mg) == job_count
+        self.logger.warning("DosingAutomationJobFinishedAsyncNotification received without full DosingResult.WeightSample.NetWeight.")
+        return False
+
+    def _on_dosing_finished(self, notification: SudsObject, command_id: int, job_count: int, actual_doses_mg: List[float]) -> bool:
+        """Handles the end of the entire job list, which is only reached if not every job reported its dosed amount."""
+        self._finish_command(command_id)
+        if notification.Outcome == 'Success':
+            self.logger.info("Dosing job list (Command ID: %s) finished successfully.", command_id)
+            self._auto_dose_finish()
+            # Only reached if some JobFinished notification did not carry a weight.
+            # If it's critical, one might re-weigh or parse CompleteCurrentTaskResponse if it has WeighingItems
+            self.logger.error("Dosing finished, but only %d of %d dosed amounts were reported in notifications.", len(actual_doses_mg), job_count)
+            raise MTXPRBalanceDosingError("Dosing finished, but final dosed amount unclear from notifications.")
+        else: # Error or Canceled
+            failure_reason = getattr(notification, 'FailureReason', 'Unknown reason') 
+            failure_desc = getattr(notification, 'FailureDescription', '')
+            raise MTXPRBalanceDosingError(f"Dosing job list failed. Reason: {failure_reason} - {failure_desc}", outcome=notification.Outcome,
+                                          error_state=str(failure_reason))
+
+    def _on_buffer_overrun(self, notification: SudsObject, command_id: int, job_count: int, actual_doses_mg: List[float]) -> bool:
+        """Warns that the balance dropped notifications."""
+        self.logger.warning("Notification buffer overrun for command %s. Some notifications may have been lost.", notification.CommandId)
+        return False
+
+    @contextlib.contextmanager
+    def smart_auto_dose_session(self, dosing_method_name: Optional[str] = None,
+                                notification_timeout_seconds: int = 200) -> Iterator[Callable[[Dict[str, Any]], float]]:
+        """
+        Keeps one automated dosing weighing task open for several doses, instead of a StartTask per dose.
+        Yields a function that runs one job (as built by _build_dose_job_dict) in the task and returns the dosed mg.
+        A failed dose cancels the task, and the next dose starts it again. The task is completed on exit.
+        :param dosing_method_name: Automated dosing method, by default the first one available.
+        :param notification_timeout_seconds: Time allowed per dose.
+        """
+        task_started = False
 
-            time.sleep(self.DEFAULT_POLL_INTERVAL)
+        def dose(job: Dict[str, Any]) -> float:
+            nonlocal task_started
+            if not task_started:
+                self._auto_dose_start(dosing_method_name)
+                task_started = True
+            try:
+                command_id = self._auto_dose_submit([job])
+                return self._auto_dose_wait(command_id, 1, notification_timeout_seconds)[0]
+            except MTXPRBalanceError:
+                self.cancel_active()
+                task_started = False
+                raise
 
-        # If loop finishes without returning, it's a timeout
-        raise MTXPRBalanceDosingError(f"Timeout ({notification_timeout_seconds}s) waiting for dosing job (Command ID: {command_id}) to finish.")
+        try:
+            yield dose
+        finally:
+            if task_started:
+                self._auto_dose_finish()
 
     def smart_auto_dose(self, 
                         substance_name: str, 
@@ -838,73 +1360,68 @@ class MTXPRBalance:
 
         total_actual_dosed_mg = 0.0
         remaining_target_mg = target_dose_amount_mg
-
-        for attempt in range(1, max_attempts + 1):
-            self.logger.info(f"Smart Dosing Attempt {attempt}/{max_attempts} for {substance_name}.")
-            self.logger.info(f"Overall Target: {target_dose_amount_mg:.3f} mg. Remaining Target for this attempt: {remaining_target_mg:.3f} mg.")
-
-            if remaining_target_mg <= 0.001: # Consider very small amounts as effectively dosed
-                self.logger.info("Remaining target is negligible. Considering dosing complete.")
-                break
-            
-            try:
-                self.close_door(MTXPRBalanceDoors.LEFT_OUTER) 
-                self.close_door(MTXPRBalanceDoors.RIGHT_OUTER) 
-                time.sleep(1) 
-                self.tare()
-                pre_dose_net_weight, _, _ = self.get_weight(capture_mode=WeighingCaptureMode.IMMEDIATE) # Get weight before dose 
-
-                # The dose_amount_mg for start_automated_dosing_job should be the remaining amount
-                dosed_this_attempt_mg = self.auto_dose(
-                    substance_name=substance_name,
-                    target_weight_mg=remaining_target_mg,
-                    lower_tolerance_percent=lower_tolerance_percent,
-                    upper_tolerance_percent=upper_tolerance_percent,
-                    dosing_method_name=dosing_method_name
-                )
+        # Doors are closed and the balance tared before the first attempt and whenever the last operation did not
+        # leave the vessel untouched (an error or an opened door). After a clean dose the next attempt doses straight away.
+        self._last_op_left_clean = False
+
+        with self.smart_auto_dose_session(dosing_method_name) as dose:
+            for attempt in range(1, max_attempts + 1):
+                self.logger.info("Smart Dosing Attempt %d/%d for %s.", attempt, max_attempts, substance_name)
+                self.logger.info("Overall Target: %.3f mg. Remaining Target for this attempt: %.3f mg.", target_dose_amount_mg, remaining_target_mg)
+
+                if remaining_target_mg <= 0.001: # Consider very small amounts as effectively dosed
+                    self.logger.info("Remaining target is negligible. Considering dosing complete.")
+                    break
                 
-                # Verify actual dispensed amount if start_automated_dosing_job returns it directly
-                if dosed_this_attempt_mg is None: # Should not happen if start_automated_dosing_job is implemented correctly
-                    self.logger.warning("start_automated_dosing_job returned None. Weighing to confirm.")
-                    time.sleep(1) 
-                    post_dose_net_weight, _, _ = self.get_weight(capture_mode=WeighingCaptureMode.STABLE)
-                    dosed_this_attempt_mg = post_dose_net_weight - pre_dose_net_weight # Net change
+                try:
+                    if not self._last_op_left_clean:
+                        # Both doors go in one SetPosition request, so the balance closes them together
+                        self.close_doors([MTXPRBalanceDoors.LEFT_OUTER, MTXPRBalanceDoors.RIGHT_OUTER])
+                        time.sleep(1) 
+                        self.tare()
+
+                    # The target of each attempt is the remaining amount
+                    dosed_this_attempt_mg = dose(self._build_dose_job_dict(substance_name, remaining_target_mg,
+                                                                           lower_tolerance_percent=lower_tolerance_percent,
+                                                                           upper_tolerance_percent=upper_tolerance_percent))
+                    
+                    if dosed_this_attempt_mg < 0:
+                        self.logger.warning(f"Negative dose detected ({dosed_this_attempt_mg:.3f} mg). This might indicate an issue. Assuming 0mg dosed for this attempt.")
+                        dosed_this_attempt_mg = 0.0
+                    self._last_op_left_clean = True
+
+
+                except MTXPRBalanceDosingError as e:
+                    # The session has already cancelled the task
+                    self.logger.error(f"Dosing attempt {attempt} failed: {e}.")
+                    self._last_op_left_clean = False
+                    if attempt == max_attempts: 
+                        raise
+                    time.sleep(2)
+                    continue 
+                except MTXPRBalanceError as e: # Catch other balance errors during setup (tare, doors)
+                    self.logger.error(f"Balance error during dosing attempt {attempt} setup: {e}")
+                    self._last_op_left_clean = False
+                    if attempt == max_attempts:
+                        raise MTXPRBalanceDosingError(f"Failed smart dosing due to balance error on last attempt: {e}") from e
+                    time.sleep(2)
+                    continue
+
+                total_actual_dosed_mg += dosed_this_attempt_mg
+                remaining_target_mg = target_dose_amount_mg - total_actual_dosed_mg
                 
-                if dosed_this_attempt_mg < 0:
-                    self.logger.warning(f"Negative dose detected ({dosed_this_attempt_mg:.3f} mg). This might indicate an issue. Assuming 0mg dosed for this attempt.")
-                    dosed_this_attempt_mg = 0.0
-
-
-            except MTXPRBalanceDosingError as e:
-                self.logger.error(f"Dosing attempt {attempt} failed: {e}. Cancelling current operation.")
-                self.cancel_active() # Cancel task if dosing errored out mid-way
-                dosed_this_attempt_mg = 0.0 # Assume nothing was dosed if error
-                if attempt == max_attempts: 
-                    raise
-                time.sleep(2)
-                continue 
-            except MTXPRBalanceError as e: # Catch other balance errors during setup (tare, weigh)
-                self.logger.error(f"Balance error during dosing attempt {attempt} setup: {e}")
-                self.cancel_active()
-                if attempt == max_attempts:
-                    raise MTXPRBalanceDosingError(f"Failed smart dosing due to balance error on last attempt: {e}") from e
-                time.sleep(2)
-                continue
-
-            total_actual_dosed_mg += dosed_this_attempt_mg
-            remaining_target_mg = target_dose_amount_mg - total_actual_dosed_mg
-            
-            self.logger.info(f"Attempt {attempt}: Dosed {dosed_this_attempt_mg:.4f} mg. Total dosed: {total_actual_dosed_mg:.4f} mg. New remaining: {remaining_target_mg:.4f} mg.")
-
-            if total_actual_dosed_mg >= (target_dose_amount_mg * (min_dosed_threshold_percent / 100.0)):
-                self.logger.info(f"Target threshold reached ({min_dosed_threshold_percent}%). Smart dosing successful.")
-                break
-            if remaining_target_mg < 0.001: # If overshot slightly but within tolerance, or very close
-                 self.logger.info("Target effectively reached or slightly overshot. Smart dosing considered complete.")
-                 break
-        else: # Loop finished without breaking (max_attempts reached and threshold not met)
-            self.logger.error(f"Smart dosing failed after {max_attempts} attempts. Total dosed: {total_actual_dosed_mg:.3f} mg (Target: {target_dose_amount_mg:.3f} mg).")
-            raise MTXPRBalanceDosingError(f"Smart dosing failed after {max_attempts} attempts. Target not met.")
+                self.logger.info("Attempt %d: Dosed %.4f mg. Total dosed: %.4f mg. New remaining: %.4f mg.",
+                                 attempt, dosed_this_attempt_mg, total_actual_dosed_mg, remaining_target_mg)
+
+                if total_actual_dosed_mg >= (target_dose_amount_mg * (min_dosed_threshold_percent / 100.0)):
+                    self.logger.info(f"Target threshold reached ({min_dosed_threshold_percent}%). Smart dosing successful.")
+                    break
+                if remaining_target_mg < 0.001: # If overshot slightly but within tolerance, or very close
+                     self.logger.info("Target effectively reached or slightly overshot. Smart dosing considered complete.")
+                     break
+            else: # Loop finished without breaking (max_attempts reached and threshold not met)
+                self.logger.error(f"Smart dosing failed after {max_attempts} attempts. Total dosed: {total_actual_dosed_mg:.3f} mg (Target: {target_dose_amount_mg:.3f} mg).")
+                raise MTXPRBalanceDosingError(f"Smart dosing failed after {max_attempts} attempts. Target not met.")
 
         return round(total_actual_dosed_mg, 4) # Return with reasonable precision
 
@@ -929,11 +1446,15 @@ class MTXPRBalance:
         """Cancels all pending asynchronous commands known to the client or on the device."""
         # WSDL CancelRequest parameters: SessionId, CancelType, CommandId (nillable int for Asynchronous) 
         # CancelType can be All, CurrentSynchronous, Asynchronous 
+        if not self._active_command_ids and time.monotonic() - self._last_cancel_all < self.CANCEL_ALL_DEBOUNCE:
+            self.logger.info("No commands started since the last cancel. Skipping Cancel.")
+            return
         try:
             self.logger.info("Attempting to cancel all pending commands on the device (CancelType: All).")
             self._request(self.SESSION_SERVICE, 'Cancel', ['All', None]) 
             self.logger.info("All pending commands cancelled on the device.")
             self._active_command_ids.clear()
+            self._last_cancel_all = time.monotonic()
         except MTXPRBalanceRequestError as e:
             self.logger.error(f"Failed to cancel all commands: {e}")
             # Don't re-raise, as this is a cleanup effort.
@@ -941,19 +1462,139 @@ class MTXPRBalance:
             self.logger.error(f"Unexpected error cancelling all commands: {e}")
 
     def __enter__(self):
-        if not self.client or not self._session_id:
+        if not self.is_connected():
             self.connect()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.logger.info("Exiting context manager. Cleaning up...")
         if self._active_command_ids:
-            self.logger.warning(f"There are active command IDs: {self._active_command_ids}. Attempting to cancel.")
+            self.logger.warning(f"There are active command IDs: {list(self._active_command_ids)}. Attempting to cancel.")
 
             self.cancel_all()
         self.close_session()
 
 
+
+class AsyncMTXPRBalance:
+    """
+    Asyncio front end for MTXPRBalance.
+    Each SOAP call runs in a worker thread, so calls to several balances, or overlapping dosing and
+    door operations on one balance, can be awaited concurrently on one event loop. The wrapped balance
+    keeps one keep-alive HTTP session (see RequestsTransport) that is shared by all of these calls.
+    """
+    def __init__(self, balance: Optional[MTXPRBalance] = None, **balance_kwargs):
+        """
+        :param balance: balance to wrap, by default a new MTXPRBalance is created from balance_kwargs
+        :param balance_kwargs: MTXPRBalance arguments, connect_on_init defaults to False here
+        """
+        if balance is None:
+            balance_kwargs.setdefault('connect_on_init', False)
+            balance = MTXPRBalance(**balance_kwargs)
+        self.balance = balance
+
+    async def connect(self) -> None:
+        await asyncio.to_thread(self.balance.connect)
+
+    async def open_session(self) -> None:
+        await asyncio.to_thread(self.balance.open_session)
+
+    async def close_session(self) -> None:
+        await asyncio.to_thread(self.balance.close_session)
+
+    async def tare(self, immediately: bool = True) -> None:
+        await asyncio.to_thread(self.balance.tare, immediately)
+
+    async def zero(self, immediately: bool = True) -> None:
+        await asyncio.to_thread(self.balance.zero, immediately)
+
+    async def get_weight(self,
+                         capture_mode: WeighingCaptureMode = WeighingCaptureMode.STABLE,
+                         timeout_seconds: int = MTXPRBalance.DEFAULT_SYNC_TIMEOUT) -> Tuple[float, str, bool]:
+        return await asyncio.to_thread(self.balance.get_weight, capture_mode, timeout_seconds)
+
+    async def set_door_position(self, door: MTXPRBalanceDoors, position: int) -> None:
+        await asyncio.to_thread(self.balance.set_door_position, door, position)
+
+    async def set_door_positions(self, positions: List[Tuple[MTXPRBalanceDoors, int]]) -> None:
+        await asyncio.to_thread(self.balance.set_door_positions, positions)
+
+    async def open_door(self, door: MTXPRBalanceDoors) -> None:
+        await self.set_door_position(door, 100)
+
+    async def close_door(self, door: MTXPRBalanceDoors) -> None:
+        await self.set_door_position(door, 0)
+
+    async def close_doors(self, doors: List[MTXPRBalanceDoors]) -> None:
+        await asyncio.to_thread(self.balance.close_doors, doors)
+
+    async def read_dosing_head(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self.balance.read_dosing_head)
+
+    async def auto_dose(self,
+                        substance_name: str,
+                        target_weight_mg: float,
+                        vial_name: str = "Vial",
+                        lower_tolerance_percent: float = 5.0, 
+                        upper_tolerance_percent: float = 5.0,
+                        dosing_method_name: Optional[str] = None,
+                        notification_timeout_seconds: int = 200) -> float:
+        job = MTXPRBalance._build_dose_job_dict(substance_name, target_weight_mg, vial_name,
+                                                lower_tolerance_percent, upper_tolerance_percent)
+        return (await self.auto_dose_batch([job], dosing_method_name, notification_timeout_seconds))[0]
+
+    async def auto_dose_batch(self,
+                              jobs: List[Dict[str, Any]],
+                              dosing_method_name: Optional[str] = None,
+                              notification_timeout_seconds: int = 200) -> List[float]:
+        """
+        Like MTXPRBalance.auto_dose_batch, but each GetNotifications long-poll is awaited on its own, so no worker
+        thread is held for the whole dose. Cancelling the awaiting task cancels the weighing task on the balance.
+        """
+        if not jobs:
+            return []
+        balance = self.balance
+        await asyncio.to_thread(balance._auto_dose_start, dosing_method_name)
+        command_id = await asyncio.to_thread(balance._auto_dose_submit, jobs)
+
+        actual_doses_mg: List[float] = []
+        timeout_seconds = notification_timeout_seconds * len(jobs)
+        end_time = time.monotonic() + timeout_seconds
+        idle_polls = 0
+        try:
+            while (remaining_seconds := end_time - time.monotonic()) > 0:
+                notifications_response = await asyncio.to_thread(balance._get_dosing_notifications, idle_polls, remaining_seconds)
+                # Processing may confirm an action on the balance, so it runs in a worker thread as well
+                if await asyncio.to_thread(balance._process_dosing_notifications, notifications_response, command_id,
+                                           len(jobs), actual_doses_mg):
+                    idle_polls = 0
+                else:
+                    idle_polls += 1
+                if len(actual_doses_mg) == len(jobs):
+                    balance._finish_command(command_id)
+                    return actual_doses_mg
+        except asyncio.CancelledError:
+            await asyncio.to_thread(balance.cancel_active)
+            raise
+        # As in _auto_dose_wait, a timed out command ID stays active for cancel_all and __exit__
+        raise MTXPRBalanceDosingError(f"Timeout ({timeout_seconds}s) waiting for dosing job list (Command ID: {command_id}) to finish.")
+
+    async def smart_auto_dose(self, *args, **kwargs) -> float:
+        """
+        MTXPRBalance.smart_auto_dose in a worker thread. One balance doses one job at a time, so heads on
+        several balances are dosed in parallel by gathering this over their AsyncMTXPRBalance objects.
+        """
+        return await asyncio.to_thread(self.balance.smart_auto_dose, *args, **kwargs)
+
+    async def __aenter__(self):
+        if not self.balance.is_connected():
+            await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await asyncio.to_thread(self.balance.__exit__, exc_type, exc_val, exc_tb)
+
+
 if __name__ == '__main__':
     BALANCE_IP = "192.168.254.83"
     BALANCE_PASSWORD = "PASSWORD"
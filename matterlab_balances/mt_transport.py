@@ -0,0 +1,58 @@
+"""
+HTTP transport for the suds client of MTXPRBalance.
+Kept separate from mt_balance so that requests and suds are only imported once a balance connects.
+"""
+
+import io
+import socket
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from suds.transport import Reply, TransportError
+from suds.transport.http import HttpTransport
+
+# Errors of a SOAP call that mean the balance could not be reached
+TRANSPORT_ERRORS = (TransportError, requests.RequestException)
+
+# urllib3 already sets TCP_NODELAY; SO_KEEPALIVE keeps idle pooled connections from being dropped silently
+# between notification long-polls
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+class _SocketOptionsAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections are opened with SOCKET_OPTIONS."""
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
+class RequestsTransport(HttpTransport):
+    """
+    Suds transport that posts SOAP requests through a requests.Session.
+    The session keeps the TCP connection to the balance alive between requests, whereas the default
+    urllib transport opens a new connection for every call. Replies may be gzip compressed, requests
+    asks for and decodes them. Documents (the local WSDL file) are still
+    opened with the default transport.
+    """
+    def __init__(self, pool_maxsize: int = 4, session: Optional[requests.Session] = None, **kwargs):
+        """
+        :param pool_maxsize: maximum number of kept-alive connections to the balance
+        :param session: session to share with another transport, suds needs one transport per client
+        """
+        super().__init__(**kwargs)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', _SocketOptionsAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=0))
+        self.session = session
+
+    def send(self, request):
+        # Connection failures raise requests exceptions, which MTXPRBalance._request reports as connection errors
+        response = self.session.post(request.url, data=request.message, headers=request.headers, timeout=request.timeout)
+        if response.status_code in (202, 204):
+            return None
+        if response.status_code >= 400:
+            # Suds parses SOAP faults from the body of the TransportError
+            raise TransportError(response.reason, response.status_code, io.BytesIO(response.content))
+        return Reply(200, response.headers, response.content)
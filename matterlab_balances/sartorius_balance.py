@@ -1,11 +1,28 @@
+import asyncio
+import os
+import re
+import sys
 import time
+from pathlib import Path
 from typing import Tuple, Optional
 
 from matterlab_serial_device import SerialDevice, open_close
-from matterlab_balances.base_balance import Balance
+from matterlab_balances.base_balance import Balance, apoll_stable, poll_stable
+
+# FTDI-style USB serial adapters buffer replies for latency_timer ms (16 by default) before passing them on
+USB_SERIAL_SYSFS = Path("/sys/bus/usb-serial/devices")
+LOW_LATENCY_TIMER_MS = 1
+
+# the balance answers a print command within ~30-100 ms, replies not complete by then are read again after the
+# delay that was used before
+READ_DELAY = 0.1
+SLOW_READ_DELAY = 0.5
 
 
 class SartoriusBalance(Balance, SerialDevice):
+    # sign, weight and unit at the end of a print reply, e.g. "+    1.2345 g", the unit is missing while unstable
+    _RESPONSE_RE = re.compile(r"([+-]?)\s*(\d+\.?\d*)\s*([^\d\s]*)\s*$")
+
     def __init__(self,
                  com_port: str,
                  units: str = "g",
@@ -33,11 +50,41 @@ class SartoriusBalance(Balance, SerialDevice):
         Balance.__init__(self)
 
         self.units: str = units
+        self._set_low_latency(com_port)
+
+    def _set_low_latency(self, com_port: str) -> None:
+        """
+        Lowers the latency timer of the USB serial adapter on Linux, which otherwise adds up to 16 ms to every query.
+        Skipped silently on other platforms and for ports that are not USB serial adapters.
+
+        Args:
+            com_port: COM port of the balance, symlinks such as /dev/serial/by-id/... are resolved
+
+        Returns:
+            None
+        """
+        if not sys.platform.startswith("linux"):
+            return
+        latency_timer = USB_SERIAL_SYSFS/os.path.basename(os.path.realpath(com_port))/"latency_timer"
+        if not latency_timer.exists():
+            return
+        try:
+            latency_timer.write_text(str(LOW_LATENCY_TIMER_MS))
+        except OSError as e:
+            self.logger.debug(f"Could not set {latency_timer}: {e}")
+        try:
+            latency_ms = int(latency_timer.read_text())
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Could not read {latency_timer}: {e}")
+            return
+        if latency_ms > LOW_LATENCY_TIMER_MS:
+            self.logger.warning(f"{latency_timer} is {latency_ms} ms, add a udev rule setting it to "
+                                f"{LOW_LATENCY_TIMER_MS} so that balance queries are not delayed.")
 
     @open_close
-    def _weigh(self, wait_time: float = 0.5) -> Tuple[bool, float]:
+    def _weigh(self, wait_time: float = READ_DELAY) -> Tuple[bool, float]:
         """
-        Get the weight reading of the balance.
+        Get the weight reading of the balance, opening the port for this reading only.
 
         Args:
             wait_time: time to wait before reading the weight
@@ -46,34 +93,45 @@ class SartoriusBalance(Balance, SerialDevice):
             (True, weight) for stable reading
             (False, weight) for unstable reading
         """
-        response: list = self.query(write_command="\x1bP\r\n", read_delay=wait_time).split()
+        return self._weigh_inner(wait_time)
 
-        # if the last element in the split return value is "g",
-        #   the reading is stable, and the weight is rtn[-2], and sign is rtn[-3]
-        # else the reading is unstable, and the weight is rtn[-1], and sign is rtn[-2]
-        if response[0] == "-":
-            sign = "-"
-        else:
-            sign = "+"
+    def _weigh_inner(self, wait_time: float = READ_DELAY) -> Tuple[bool, float]:
+        """
+        Get the weight reading of the balance, the port must be open.
 
-        if response[-1] != self.units:
-            weight = float(sign + response[-1])
-            stable: bool = False
-        else:
-            weight = float(sign + response[-2])
-            stable: bool = True
+        Args:
+            wait_time: time to wait before reading the weight
+
+        Returns:
+            (True, weight) for stable reading
+            (False, weight) for unstable reading
+        """
+        response: str = self.query(write_command="\x1bP\r\n", read_delay=wait_time)
+        match = self._RESPONSE_RE.search(response)
+        if match is None and wait_time < SLOW_READ_DELAY:
+            self.logger.debug("Incomplete balance reply %r, reading again.", response)
+            response = self.query(write_command="\x1bP\r\n", read_delay=SLOW_READ_DELAY)
+            match = self._RESPONSE_RE.search(response)
 
-        self.logger.info(f"Stable: {stable}, Weight: {weight} {self.units}.")
+        # the reading is stable if the unit is printed after the weight
+        if match is None:
+            raise IOError(f"Could not parse balance reply {response!r}.")
+        sign, weight, unit = match.groups()
+        weight = -float(weight) if sign == "-" else float(weight)
+        stable: bool = unit == self.units
+
+        self.logger.debug("Stable: %s, Weight: %s %s.", stable, weight, self.units)
         return stable, weight
 
-    def _weigh_stable(self, max_tries: int = 10, wait_time: float = 5) -> float:
+    @open_close
+    def _weigh_stable(self, max_tries: int = 10, wait_time: float = 5, poll_interval: float = 0.05) -> float:
         """
-        Gets a stable weight. If the weight hasn't stabilized (weigh method returns None instead of a float),
-        waits for wait_time seconds. If the max_tries is reached, raises an error.
+        Gets a stable weight, keeping the port open for all readings, see _weigh_stable_inner.
 
         Args:
-            max_tries: maximum number of tries to get a stable weight
-            wait_time: time to wait before trying again
+            max_tries: together with wait_time, the total time to wait for a stable weight
+            wait_time: together with max_tries, the total time to wait for a stable weight
+            poll_interval: time to wait between readings
 
         Returns:
             float: stable weight reading
@@ -81,20 +139,79 @@ class SartoriusBalance(Balance, SerialDevice):
         Raises:
             IOError: if the balance is not stable in weighing
         """
-        # try to weigh max_tries times
-        for i in range(0, max_tries):
-            stable, weight = self._weigh()
-            # if returned weight is (0, weight) or (False, weight), the weighing result is not yet stable
-            #   wait for wait_time seconds, continue the loop
-            # else return the weight
-            if not stable:
-                self.logger.info(f"Weight not stable, waiting for {wait_time} seconds.")
-                time.sleep(wait_time)
-            else:
-                return weight
-        # reach here if hit max_tries
-        # raise error that balance is not stable in weighing
-        raise IOError("Could not get a stable balance reading.")
+        return self._weigh_stable_inner(max_tries, wait_time, poll_interval)
+
+    def _weigh_stable_inner(self, max_tries: int = 10, wait_time: float = 5, poll_interval: float = 0.05) -> float:
+        """
+        Gets a stable weight, the port must be open. Readings are taken back to back, poll_interval apart, so a stable weight is returned
+        as soon as the balance settles. If no reading is stable within max_tries * wait_time seconds, raises an error.
+
+        Args:
+            max_tries: together with wait_time, the total time to wait for a stable weight
+            wait_time: together with max_tries, the total time to wait for a stable weight
+            poll_interval: time to wait between readings
+
+        Returns:
+            float: stable weight reading
+
+        Raises:
+            IOError: if the balance is not stable in weighing
+        """
+        last_stable: Optional[bool] = None
+
+        def read() -> Tuple[bool, float]:
+            nonlocal last_stable
+            stable, weight = self._weigh_inner()
+            # only log when the reading changes between stable and unstable, not on every reading
+            if stable != last_stable:
+                self.logger.info("Stable: %s, Weight: %s %s.", stable, weight, self.units)
+                last_stable = stable
+            return stable, weight
+
+        return poll_stable(read, fast_window=0, slow_interval=poll_interval, timeout=max_tries * wait_time)
+
+    async def _aweigh(self, wait_time: float = READ_DELAY) -> Tuple[bool, float]:
+        """
+        Gets the weight reading of the balance in a worker thread, as the serial port is blocking.
+
+        Args:
+            wait_time: time to wait before reading the weight
+
+        Returns:
+            (True, weight) for stable reading
+            (False, weight) for unstable reading
+        """
+        return await asyncio.to_thread(self._weigh, wait_time)
+
+    async def aweigh_stable(self, max_tries: int = 10, wait_time: float = 5, poll_interval: float = 0.05) -> float:
+        """
+        asyncio version of _weigh_stable. Waits between readings on the event loop, so other work, e.g. a robot
+        move, can be gathered with it.
+
+        Args:
+            max_tries: together with wait_time, the total time to wait for a stable weight
+            wait_time: together with max_tries, the total time to wait for a stable weight
+            poll_interval: time to wait between readings
+
+        Returns:
+            float: stable weight reading
+
+        Raises:
+            IOError: if the balance is not stable in weighing
+        """
+        last_stable: Optional[bool] = None
+
+        async def read() -> Tuple[bool, float]:
+            nonlocal last_stable
+            stable, weight = await self._aweigh()
+            if stable != last_stable:
+                self.logger.info("Stable: %s, Weight: %s %s.", stable, weight, self.units)
+                last_stable = stable
+            return stable, weight
+
+        weight = await apoll_stable(read, fast_window=0, slow_interval=poll_interval, timeout=max_tries * wait_time)
+        self.logger.info("Balance reading, stable: %s %s.", weight, self.units)
+        return weight
 
     def weigh(self, stable: bool = False, **kwargs) -> float:
         """
@@ -109,17 +226,29 @@ class SartoriusBalance(Balance, SerialDevice):
         """
         if stable:
             weight: float = self._weigh_stable(**kwargs)
-            self.logger.info(f"Balance reading, stable: {weight} {self.units}.")
+            self.logger.info("Balance reading, stable: %s %s.", weight, self.units)
         else:
             weight: float = self._weigh()[1]
-            self.logger.info(f"Balance reading: {weight} {self.units}.")
+            self.logger.info("Balance reading: %s %s.", weight, self.units)
 
         return weight
 
     @open_close
     def _tare(self, delay: float = 1) -> None:
         """
-        Tares the balance.
+        Tares the balance, opening the port for this command only.
+
+        Args:
+            delay: time to wait after sending the tare command
+
+        Returns:
+            None
+        """
+        self._tare_inner(delay)
+
+    def _tare_inner(self, delay: float = 1) -> None:
+        """
+        Tares the balance, the port must be open.
 
         Args:
             delay: time to wait after sending the tare command
@@ -131,9 +260,11 @@ class SartoriusBalance(Balance, SerialDevice):
         self.write("\x1bT\r\n")
         time.sleep(delay)
 
+    @open_close
     def _tare_stable(self, max_tries: int = 10, wait_time: float = 10, tolerance: float = 0.01) -> bool:
         """
         Tares the balance until stable. If the balance is not stable after max_tries, raises an error.
+        The port is opened once for all tare commands and readings.
 
         Args:
             max_tries: maximum number of tries to tare the balance
@@ -147,11 +278,11 @@ class SartoriusBalance(Balance, SerialDevice):
             IOError: if the balance is not stable after max_tries
         """
         # tare the balance and wait for 5 seconds
-        self._tare()
+        self._tare_inner()
         time.sleep(5)
         for i in range(0, max_tries):
             # get weight after tare
-            weight = self._weigh_stable()
+            weight = self._weigh_stable_inner()
             # if weight returned is less than tolerance range
             #   tare successful, return True
             # else wait for wait_time, retare
@@ -159,11 +290,37 @@ class SartoriusBalance(Balance, SerialDevice):
                 return True
             else:
                 time.sleep(wait_time)
-                self._tare()
+                self._tare_inner()
         # reach here if tare hit max_tries
         # raise error as balance is not stable in taring
         raise IOError("Could not get the balance to tare reliably.")
 
+    async def atare_stable(self, max_tries: int = 10, wait_time: float = 10, tolerance: float = 0.01) -> bool:
+        """
+        asyncio version of _tare_stable. Waits on the event loop instead of blocking the interpreter.
+
+        Args:
+            max_tries: maximum number of tries to tare the balance
+            wait_time: time to wait before trying again
+            tolerance: tolerance for taring the balance
+
+        Returns:
+            bool: True if tare is successful
+
+        Raises:
+            IOError: if the balance is not stable after max_tries
+        """
+        await asyncio.to_thread(self._tare)
+        await asyncio.sleep(5)
+        for i in range(0, max_tries):
+            weight = await self.aweigh_stable()
+            if abs(weight) <= tolerance:
+                self.logger.info("Balance tared.")
+                return True
+            await asyncio.sleep(wait_time)
+            await asyncio.to_thread(self._tare)
+        raise IOError("Could not get the balance to tare reliably.")
+
     def tare(self, stable: bool = False, **kwargs) -> None:
         """
         Tares the balance.
@@ -0,0 +1,30 @@
+"""
+Per substance dosing parameters for MTXPRBalance.auto_dose.
+
+Tolerances are given in percent of the target, with an absolute floor in mg so that small doses
+(< 5 mg) are not held to a tolerance below what the powder can be dosed to.
+"""
+
+from typing import Any, Dict
+
+# substance name -> tolerance_percent, min_tolerance_mg, notification_timeout_seconds
+PARAMS: Dict[str, Dict[str, Any]] = {
+    'NaCl': {'tolerance_percent': 2.0, 'min_tolerance_mg': 0.05, 'notification_timeout_seconds': 200},
+}
+DEFAULT: Dict[str, Any] = {'tolerance_percent': 5.0, 'min_tolerance_mg': 0.1, 'notification_timeout_seconds': 200}
+
+
+def dose_kwargs(substance_name: str, target_weight_mg: float) -> Dict[str, Any]:
+    """
+    Keyword arguments for MTXPRBalance.auto_dose for a substance and target.
+    :param substance_name: name of the substance, unknown substances use DEFAULT
+    :param target_weight_mg: target weight in mg
+    :return: dict with lower_tolerance_percent, upper_tolerance_percent and notification_timeout_seconds
+    """
+    params = PARAMS.get(substance_name, DEFAULT)
+    tolerance_percent = max(params['tolerance_percent'], 100.0 * params['min_tolerance_mg'] / target_weight_mg)
+    return {
+        'lower_tolerance_percent': tolerance_percent,
+        'upper_tolerance_percent': tolerance_percent,
+        'notification_timeout_seconds': params['notification_timeout_seconds'],
+    }
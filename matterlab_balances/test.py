@@ -1,12 +1,8 @@
-from mt_balance import MTXPRBalance
-from mt_balance import MTXPRBalanceDoors
-from mt_balance import WeighingCaptureMode
-import time
+from matterlab_balances.config import get_balance
+from matterlab_balances.mt_balance import MTXPRBalanceDoors
+from matterlab_balances.mt_balance import WeighingCaptureMode
 
-BALANCE_IP = "192.168.254.83"
-BALANCE_PASSWORD = "PASSWORD"
-
-balance = MTXPRBalance (host = BALANCE_IP, password = BALANCE_PASSWORD)
+balance = get_balance()
 
 
 # Get the current status of the balance; TRUE = DOOR OPEN, FALSE = DOOR CLOSED
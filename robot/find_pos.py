@@ -1,28 +1,23 @@
 import urx
 
 class FindPos:
-    def __init__(self):
-        self.rob = urx.Robot("192.168.254.19")
+    def __init__(self, rob=None):
+        # rob: existing urx.Robot to reuse, e.g. URController.rob, instead of opening another connection
+        self.rob = rob if rob is not None else urx.Robot("192.168.254.19")
 
 
     def print_lj(self):
-        print('{')
-        print(f'"l": {[round(x, 4) for x in self.rob.getl()]},')
-        print(f'"j": {[round(x,4) for x in self.rob.getj()]}'+'},\n')
+        l = [round(x, 4) for x in self.rob.getl()]
+        j = [round(x, 4) for x in self.rob.getj()]
+        # one write for the whole entry
+        print(f'{{\n"l": {l},\n"j": {j}}},\n')
 
     def movel(self,
             x = 0, y = 0, z = 0,
             rx = 0, ry = 0, rz = 0,
             vel = 0.1, acc = 1.2):
         current_pose = self.rob.getl()
-        target_pose = [
-            current_pose[0] + x,
-            current_pose[1] + y,
-            current_pose[2] + z,
-            current_pose[3] + rx,
-            current_pose[4] + ry,
-            current_pose[5] + rz
-        ]
+        target_pose = [c + d for c, d in zip(current_pose, (x, y, z, rx, ry, rz))]
         self.rob.movel(target_pose, acc=acc, vel=vel)
         self.print_lj()
 
@@ -1,37 +1,65 @@
 import socket
 import time
 
-def send_gripper_command(command, ip="192.168.254.19", port=63352):
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.settimeout(5)
+def connect_gripper(ip="192.168.254.19", port=63352):
+    s = socket.create_connection((ip, port), timeout=2.0)
+    # send the small commands immediately and keep the idle connection alive between inputs
+    s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    return s
+
+def send_gripper_command(command, ip="192.168.254.19", port=63352, sock=None):
+    # sock: connection from connect_gripper to reuse, otherwise a connection is opened for this command only
+    try:
+        s = sock or connect_gripper(ip, port)
         try:
-            s.connect((ip, port))
             s.sendall(command.encode('utf-8') + b'\n')
             data = s.recv(1024)
             print(f"[SENT] {command}")
             print(f"[RECV] {data.decode(errors='ignore')}")
-        except Exception as e:
-            print("[ERROR]", e)
+        finally:
+            if sock is None:
+                s.close()
+    except Exception as e:
+        print("[ERROR]", e)
 
 
 # send_gripper_command('SET ACT 1')
 # time.sleep(1)
 
 
+def wait_until(sock, variable, value, equal, timeout=2.0, poll=0.05):
+    # poll 'GET <variable>' (answered as "<variable> <value>") until it equals value, or differs from it if not equal
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            sock.sendall(f'GET {variable}\n'.encode('utf-8'))
+            if (sock.recv(1024).decode(errors='ignore').split()[-1:] == [value]) == equal:
+                return
+        except OSError as e:
+            print("[ERROR]", e)
+            return
+        time.sleep(poll)
+
+
+def wait_motion(sock, timeout=2.0, poll=0.05):
+    # OBJ is 0 while the fingers move, and non-zero once they stopped at the position or on an object
+    wait_until(sock, 'OBJ', '0', False, timeout, poll)
+
+
 def percentage_to_socket_value(percent):
     return int(max(0, min(100, percent)) * 2.55)
 
 def main():
     print("== Gripper Socket Control ==")
     print("Initializing gripper...\n")
+    # One connection for the whole session instead of a handshake per command
+    sock = connect_gripper()
 
-    # Step 1: Activate gripper
-    send_gripper_command("SET ACT 1")
-    time.sleep(0.5)
-
-    # Step 2: Set Gripper to Go (Start Action Mode)
-    send_gripper_command("SET GTO 1")
-    time.sleep(0.5)
+    # Activate gripper and set it to Go (Start Action Mode) with max speed and medium force in one command
+    send_gripper_command("SET ACT 1 GTO 1 SPE 255 FOR 150", sock=sock)
+    # STA 3: activation completed
+    wait_until(sock, 'STA', '3', True)
 
     print("\nGripper ready. Type a percentage (0–100) to move.")
     print("Type 'exit' to quit.\n")
@@ -44,10 +72,11 @@ def main():
             percent = float(user_input)
             pos_val = percentage_to_socket_value(percent)
             print(f"→ Sending gripper position {pos_val} for {percent:.2f}%")
-            send_gripper_command(f"SET POS {pos_val} GTO01")
-            time.sleep(0.5)  # Give time for motion to complete
+            send_gripper_command(f"SET POS {pos_val} GTO 1", sock=sock)
+            wait_motion(sock)
         except ValueError:
             print("⚠️ Please enter a valid number or 'exit'.")
+    sock.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,15 @@
 import urx
+import asyncio
+import atexit
+import functools
+import inspect
+import os
 import socket
+import threading
 import time
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from urx.urrobot import RobotException
 
 # HOST = "192.168.254.19"  # Gripper's IP 
@@ -10,26 +18,81 @@ from urx.urrobot import RobotException
 # pos = rob.getl()
 # print(pos)
 
+@functools.lru_cache(maxsize=8)
+def _load_locations(path: str) -> dict:
+    """Parses a robot location file once per process, by absolute path."""
+    with open(path, 'r') as f:
+        return json.load(f)["rob_locations"]
+
+
 class URController:
-    
+    # controllers by robot IP, and the arguments they were constructed with, see get
+    _instances: Dict[str, "URController"] = {}
+    _instance_args: Dict[str, dict] = {}
+
+    @classmethod
+    def get(cls, ur_ip = "192.168.254.19", **kwargs) -> "URController":
+        """
+        Returns the controller of the robot at ur_ip, connecting on first use so that the robot gets one connection.
+        Raises ValueError if kwargs differ from the arguments the existing controller was constructed with.
+        """
+        if ur_ip not in cls._instances:
+            bound = inspect.signature(cls.__init__).bind(None, ur_ip, **kwargs)
+            bound.apply_defaults()
+            cls._instances[ur_ip] = cls(ur_ip, **kwargs)
+            cls._instance_args[ur_ip] = {name: value for name, value in bound.arguments.items() if name != "self"}
+            return cls._instances[ur_ip]
+        args = cls._instance_args[ur_ip]
+        differing = {name: value for name, value in kwargs.items() if args.get(name) != value}
+        if differing:
+            raise ValueError(f"URController for {ur_ip} exists with {', '.join(f'{name}={args.get(name)!r}' for name in differing)}, "
+                             f"got {', '.join(f'{name}={value!r}' for name, value in differing.items())}")
+        return cls._instances[ur_ip]
+
     def __init__(self,
                  ur_ip = "192.168.254.19",
                  gripper_port = 63352,
-                 location_file="ur3_positions.json"):
-        try:
-            self.rob = urx.Robot(ur_ip)
-            print("UR Robot connected!")
-        except Exception as e:
-            print(f"Failed to connect to UR Robot: {e}")
+                 location_file="ur3_positions.json",
+                 rob: Optional[urx.Robot] = None):
+        # rob: existing connection to the robot to reuse, otherwise one is opened to ur_ip
+        if rob is not None:
+            self.rob = rob
+        else:
+            try:
+                self.rob = urx.Robot(ur_ip)
+                print("UR Robot connected!")
+            except Exception as e:
+                print(f"Failed to connect to UR Robot: {e}")
 
         # import ur3_positions.json file
-        with open("ur3_positions.json", 'r') as f:
-            data = json.load(f)
-            self.loc = data["rob_locations"]
+        self.loc = _load_locations(os.path.abspath(location_file))
+
+        # joint positions ("j") and tool poses ("l") by location name, checked once here instead of on every move
+        self._joints = {}
+        self._poses = {}
+        for name, location in self.loc.items():
+            joints = location.get("j")
+            if not joints or len(joints) != 6:
+                raise ValueError(f"Invalid joint data for {name}")
+            self._joints[name] = tuple(joints)
+            if len(location.get("l") or []) == 6:
+                self._poses[name] = tuple(location["l"])
 
         # connect to gripper
         self.gripper_ip = ur_ip
         self.gripper_port = gripper_port
+        # one TCP connection to the gripper is kept open for all commands, see _ensure_gripper
+        self._gripper_sock: Optional[socket.socket] = None
+        # guards the connection, commands from _gripper_pool and the caller's thread must not interleave on it
+        self._gripper_lock = threading.RLock()
+        atexit.register(self.close_gripper)
+        # sends gripper commands while the arm moves, one at a time so the connection is never shared
+        self._gripper_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gripper")
+        # asyncio connection to the gripper for the a* methods, bound to the event loop it was opened on
+        self._gripper_reader: Optional[asyncio.StreamReader] = None
+        self._gripper_writer: Optional[asyncio.StreamWriter] = None
+        self._gripper_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._gripper_alock: Optional[asyncio.Lock] = None
 
         self.gripper_dist = {
             "open":{"vial": 214, "dose": 165},
@@ -48,37 +111,190 @@ class URController:
         self._rob_loc = None
         self._gripper_item = None
             
-    def send_gripper_command(self,command):
-        """Send a command to the gripper and print the response."""
-        
+    def _ensure_gripper(self) -> socket.socket:
+        """Returns the connection to the gripper, connecting on first use or after a failure."""
+        if self._gripper_sock is None:
+            # Creates a TCP/IP connection, kept open instead of a handshake per command
+            # SET commands are answered at once, so a short timeout is enough
+            self._gripper_sock = socket.create_connection((self.gripper_ip, self.gripper_port), timeout=2.0)
+            # send the small commands immediately instead of waiting on Nagle's algorithm,
+            # and keep the idle connection alive between commands
+            self._gripper_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._gripper_sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return self._gripper_sock
+
+    def close_gripper(self):
+        """Closes the connection to the gripper, the next command reconnects."""
+        with self._gripper_lock:
+            if self._gripper_sock is not None:
+                self._gripper_sock.close()
+                self._gripper_sock = None
+
+    def _gripper_exchange(self, command) -> str:
+        """Send a command to the gripper and return its response, reopening a dropped connection once."""
+        with self._gripper_lock:
+            for attempt in range(2):
+                try:
+                    sock = self._ensure_gripper()
+                    # Encode command as UTF-8 bytes with newline, then send entire message to gripper over TCP
+                    sock.sendall(command.encode('utf-8') + b'\n')
+                    data = sock.recv(1024)
+                    if not data:
+                        raise ConnectionError("Gripper closed the connection")
+                    return data.decode(errors="ignore")
+                except OSError:
+                    self.close_gripper()
+                    if attempt:
+                        raise
+
+    def send_gripper_commands(self, commands: List[str]):
+        """Send commands to the gripper over one connection and print the responses."""
         try:
-            # Creates a TCP/IP socket, AF_INET = IPv4 and SOCK_STREAM = TCP (not UDP)
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(10)
-                s.connect((self.gripper_ip, self.gripper_port))
-                # Encode command as UTF-8 bytes with newline, then send entire message to gripper over TCP
-                s.sendall(command.encode('utf-8') + b'\n')
-                data = s.recv(1024)
+            for command in commands:
+                response = self._gripper_exchange(command)
                 print(f"Sent: {command}")
-                print("Response:", data.decode(errors="ignore"))
+                print("Response:", response)
         except Exception as e:
                 print("Error:", e)
 
-    def activate_gripper(self):
-        self.send_gripper_command("SET ACT 1")
-        time.sleep(2)
+    def send_gripper_command(self,command):
+        """Send a command to the gripper and print the response."""
+        self.send_gripper_commands([command])
+
+    def _gripper_send_async(self, command) -> Future:
+        """
+        Send a command to the gripper in the background, the returned Future completes once it is acknowledged.
+        Unlike send_gripper_command, errors are not printed but raised by Future.result().
+        """
+        return self._gripper_pool.submit(self._gripper_exchange, command)
+
+    def _wait_motion(self, timeout: float = 2.0, poll: float = 0.01):
+        """Wait until the robot has no program running. Raises RobotException after timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while self.rob.is_program_running():
+            if time.monotonic() >= deadline:
+                raise RobotException(f"Robot program still running after {timeout} s")
+            time.sleep(poll)
+
+    def _wait_gripper(self, variable: str, done, timeout: float = 2.0, poll: float = 0.05):
+        """
+        Poll 'GET <variable>' until done(value) is true, at most timeout seconds.
+        Raises RobotException on timeout or if the gripper cannot be read.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                # the response is "<variable> <value>"
+                value = self._gripper_exchange(f"GET {variable}").split()[-1]
+                if done(int(value)):
+                    return
+            except (OSError, ValueError, IndexError) as e:
+                raise RobotException(f"Reading gripper {variable} failed: {e}") from e
+            if time.monotonic() >= deadline:
+                raise RobotException(f"Gripper {variable} did not reach the expected value within {timeout:.2f} s, last {value}")
+            time.sleep(poll)
+
+    def gripper_program(self, **variables):
+        """Set several gripper variables in one command, e.g. gripper_program(POS=255, GTO=1) sends 'SET POS 255 GTO 1'."""
+        self.send_gripper_command("SET " + " ".join(f"{name} {value}" for name, value in variables.items()))
+
+    def activate_gripper(self, speed: int = 255, force: int = 150):
+        # activate, enable motion and set max speed and medium force in one command
+        self.gripper_program(ACT=1, GTO=1, SPE=speed, FOR=force)
+        # STA 3: activation completed
+        self._wait_gripper("STA", lambda sta: sta == 3)
 
     def gripper_position(self, pos):
         pos = max(0,min(255,pos))
-        self.send_gripper_command(f"SET POS {pos} GTO1")
+        # GTO 1 starts the motion
+        self.gripper_program(POS=pos, GTO=1)
+
+    def wait_gripper_motion(self, pos, timeout: float = 2.0):
+        """
+        Wait until the gripper sent to pos has stopped, i.e. reached the position or an object (OBJ is 0 while moving).
+        OBJ still reports the previous stop until the motion starts, so first wait for the position request (PRE) to be pos.
+        """
+        pos = max(0,min(255,pos))
+        deadline = time.monotonic() + timeout
+        self._wait_gripper("PRE", lambda pre: pre == pos, timeout=timeout)
+        self._wait_gripper("OBJ", lambda obj: obj != 0, timeout=max(0.0, deadline - time.monotonic()))
+
+    async def _aensure_gripper(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Returns the asyncio connection to the gripper, connecting on first use or after a failure."""
+        if self._gripper_writer is None:
+            self._gripper_reader, self._gripper_writer = await asyncio.wait_for(
+                asyncio.open_connection(self.gripper_ip, self.gripper_port), timeout=2.0)
+            sock = self._gripper_writer.get_extra_info("socket")
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        return self._gripper_reader, self._gripper_writer
+
+    async def aclose_gripper(self):
+        """Closes the asyncio connection to the gripper, the next a* command reconnects."""
+        if self._gripper_writer is not None:
+            writer, self._gripper_writer, self._gripper_reader = self._gripper_writer, None, None
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _asend(self, command) -> str:
+        """asyncio version of _gripper_exchange, the event loop runs other work while waiting for the gripper."""
+        loop = asyncio.get_running_loop()
+        if self._gripper_loop is not loop:
+            # streams and locks cannot be shared between event loops, e.g. successive asyncio.run calls
+            self._gripper_reader, self._gripper_writer = None, None
+            self._gripper_alock = asyncio.Lock()
+            self._gripper_loop = loop
+        async with self._gripper_alock:
+            for attempt in range(2):
+                try:
+                    reader, writer = await self._aensure_gripper()
+                    writer.write(command.encode('utf-8') + b'\n')
+                    await writer.drain()
+                    data = await asyncio.wait_for(reader.read(1024), timeout=2.0)
+                    if not data:
+                        raise ConnectionError("Gripper closed the connection")
+                    return data.decode(errors="ignore")
+                except (OSError, asyncio.TimeoutError):
+                    await self.aclose_gripper()
+                    if attempt:
+                        raise
+
+    async def _await_gripper(self, variable: str, done, timeout: float = 2.0, poll: float = 0.05):
+        """asyncio version of _wait_gripper."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                value = (await self._asend(f"GET {variable}")).split()[-1]
+                if done(int(value)):
+                    return
+            except (OSError, asyncio.TimeoutError, ValueError, IndexError) as e:
+                raise RobotException(f"Reading gripper {variable} failed: {e}") from e
+            if time.monotonic() >= deadline:
+                raise RobotException(f"Gripper {variable} did not reach the expected value within {timeout:.2f} s, last {value}")
+            await asyncio.sleep(poll)
+
+    async def agripper_position(self, pos, wait: bool = True):
+        """
+        asyncio version of gripper_position, e.g. gather it with SartoriusBalance.aweigh_stable.
+        With wait, returns once the gripper has stopped, see wait_gripper_motion.
+        """
+        pos = max(0,min(255,pos))
+        print("Response:", await self._asend(f"SET POS {pos} GTO 1"))
+        if wait:
+            deadline = time.monotonic() + 2.0
+            await self._await_gripper("PRE", lambda pre: pre == pos)
+            await self._await_gripper("OBJ", lambda obj: obj != 0, timeout=max(0.0, deadline - time.monotonic()))
 
     def movej(self,
             pos: str,
             vel: float = 1,
             acc: float = 1.4):
-        joints = self.loc[pos]["j"]
-        if not joints or len(joints)!=6:
-         raise ValueError(f"Invalid joint data for {pos}")
+        joints = self._joints.get(pos)
+        if joints is None:
+            raise ValueError(f"Unknown location {pos}")
         
         try:
             self.rob.movej(joints, acc=acc, vel=vel)
@@ -87,19 +303,53 @@ class URController:
         finally:
             self._rob_loc = pos
 
+    def movej_path(self,
+            positions: List[str],
+            vel: float = 1,
+            acc: float = 1.4,
+            radius: float = 0.01,
+            timeout: float = 30.0):
+        """
+        Joint moves through several locations as one URScript program, blending between them within radius (m),
+        so the arm does not stop at each waypoint and the next move is not sent only after the last one finished.
+        """
+        path = []
+        for pos in positions:
+            joints = self._joints.get(pos)
+            if joints is None:
+                raise ValueError(f"Unknown location {pos}")
+            path.append(joints)
+        if not path:
+            return
+
+        # the last move stops at its location
+        moves = "".join(f"  movej([{','.join(map(str, joints))}], a={acc}, v={vel}, r={radius if i < len(path) - 1 else 0})\n"
+                        for i, joints in enumerate(path))
+        try:
+            self.rob.send_program(f"def movej_path():\n{moves}end\n")
+            self._wait_joints(path[-1], timeout)
+        except RobotException as e:
+            print(f"[Warning] RobotException while moving through {positions}: {e}")
+        finally:
+            self._rob_loc = positions[-1]
+
+    def _wait_joints(self, target, timeout: float, tolerance: float = 1e-3, poll: float = 0.01):
+        """Wait until the robot has stopped at the target joint positions, at most timeout seconds."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if (all(abs(j - t) < tolerance for j, t in zip(self.rob.getj(), target))
+                    and not self.rob.is_program_running()):
+                return
+            time.sleep(poll)
+        raise RobotException(f"Robot did not reach {target} within {timeout} s")
+
     def movel(self,
             x = 0, y = 0, z = 0,
             rx = 0, ry = 0, rz = 0,
             vel = 0.1, acc = 1.2):
+        # read back every time, the arm may have been moved outside this controller (e.g. FindPos or the teach pendant)
         current_pose = self.rob.getl()
-        target_pose = [
-            current_pose[0] + x,
-            current_pose[1] + y,
-            current_pose[2] + z,
-            current_pose[3] + rx,
-            current_pose[4] + ry,
-            current_pose[5] + rz
-        ]
+        target_pose = [c + d for c, d in zip(current_pose, (x, y, z, rx, ry, rz))]
         try:
             print(f"[Debug] Executing movel to: {target_pose}")
             self.rob.movel(target_pose, acc=acc, vel=vel)
@@ -116,9 +366,8 @@ class URController:
             raise ValueError("start position should be 'home'")
     # if self._gripper_item is not None:
     #     raise ValueError("move to vial rack gripper must be None")
-        self.movej("safe_rack_vial_h")
-        self.movej("rack_center_h")
-        self._rob_loc = "rack_center_h"
+        # blended, so the arm passes safe_rack_vial_h without stopping
+        self.movej_path(["safe_rack_vial_h", "rack_center_h"])
 
     def vial_rack_2_vial(self,release_vial:bool):
         print(f"[Debug] release_vial = {release_vial}")
@@ -128,16 +377,23 @@ class URController:
             if self._gripper_item is not None:
                 raise ValueError("move to vial rack gripper must be None")
         
-            self.gripper_position(self.gripper_dist["open"]["vial"])
+            # the gripper opens while the arm moves to the pre-grip position
             print("[Debug] Opening gripper...")
+            opened = self._gripper_send_async(f"SET POS {self.gripper_dist['open']['vial']} GTO 1")
             self.movej("pre_A1vial_grip_h")
-            time.sleep(2)
+            self._wait_motion()
+            # the command is bounded by the socket timeout; raises if it could not be sent
+            opened.result()
+            # the jaws must be fully open before descending around the vial
+            self.wait_gripper_motion(self.gripper_dist["open"]["vial"])
             self.movej("A1vial_grip_h")
-            time.sleep(2)
+            self._wait_motion()
             self.gripper_position(self.gripper_dist["close"]["vial"])
-            print("[Debug] Opening gripper...")
+            print("[Debug] Closing gripper...")
+            # the vial must be gripped before lifting it
+            self.wait_gripper_motion(self.gripper_dist["close"]["vial"])
             self.movel(z = 0.08)
-            time.sleep(2)
+            self._wait_motion()
             self.movej("safe_rack_vial_h")
 
             self._gripper_item = "vial"
@@ -145,8 +401,9 @@ class URController:
 
 # Using the robot using the class URController
 
-rob = URController()
-rob.home_h()
+if __name__ == "__main__":
+    rob = URController.get()
+    rob.home_h()
 #rob.movel(z =0.05)                  
 
 
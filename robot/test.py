@@ -3,9 +3,10 @@ from find_pos import FindPos
 import time
 
 def main():
-    ur = URController()
-    fp = FindPos()
-    rob = URController()
+    # ur, fp and rob share one connection to the robot
+    ur = URController.get()
+    fp = FindPos(rob=ur.rob)
+    rob = URController.get()
 
 
     print("\n--- Testing gripper ---") # test pased
@@ -0,0 +1,47 @@
+from suds.client import Client
+
+from matterlab_balances.mt_balance import BASE_PATH, DEFAULT_WSDL_OUTPUT_NAME, MTXPRBalance
+
+COMMAND_ID = 7
+
+JOB_FINISHED = (
+    '<DosingAutomationJobFinishedAsyncNotification><CommandId>{command_id}</CommandId><Outcome>Success</Outcome>'
+    '<DosingResult><WeightSample><NetWeight><Value>{value}</Value><Unit>Milligram</Unit></NetWeight></WeightSample>'
+    '</DosingResult><DosingError i:nil="true"/></DosingAutomationJobFinishedAsyncNotification>'
+)
+
+REPLY = (
+    '<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/" '
+    'xmlns:i="http://www.w3.org/2001/XMLSchema-instance"><s:Body>'
+    '<GetNotificationsResponse xmlns="http://MT/Laboratory/Balance/XprXsr/V03">'
+    '<Outcome>Success</Outcome><Notifications>{notifications}</Notifications>'
+    '</GetNotificationsResponse></s:Body></s:Envelope>'
+)
+
+
+def _notifications_reply(notifications: str):
+    """Unmarshals a canned GetNotifications reply with the WSDL of the balance."""
+    client = Client((BASE_PATH/DEFAULT_WSDL_OUTPUT_NAME).as_uri())
+    reply = REPLY.format(notifications=notifications).encode()
+    return client.service[MTXPRBalance.NOTIFICATION_SERVICE].GetNotifications(1000, __inject={'reply': reply})
+
+
+def test_same_type_notifications_in_one_reply():
+    """Suds returns several notifications of one type as a list, each of them must be handled."""
+    balance = MTXPRBalance(connect_on_init=False)
+    response = _notifications_reply(
+        JOB_FINISHED.format(command_id=COMMAND_ID, value=1.5) + JOB_FINISHED.format(command_id=COMMAND_ID, value=2.5))
+
+    actual_doses_mg = []
+    assert balance._process_dosing_notifications(response, COMMAND_ID, 2, actual_doses_mg)
+    assert actual_doses_mg == [1.5, 2.5]
+
+
+def test_notifications_of_other_commands_are_skipped():
+    balance = MTXPRBalance(connect_on_init=False)
+    response = _notifications_reply(
+        JOB_FINISHED.format(command_id=COMMAND_ID + 1, value=1.5) + JOB_FINISHED.format(command_id=COMMAND_ID, value=2.5))
+
+    actual_doses_mg = []
+    balance._process_dosing_notifications(response, COMMAND_ID, 2, actual_doses_mg)
+    assert actual_doses_mg == [2.5]
@@ -2,97 +2,221 @@
 Main dosing workflow that integrates robot arm and balance operations.
 """
 
+import asyncio
+import copy
 import json
+import logging
 import time
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
-# Add parent directories to path to import modules
-sys.path.append(str(Path(__file__).parent.parent))
+try:
+    # faster JSON parser if installed, its JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
-from matterlab_balances.mt_balance import MTXPRBalance, MTXPRBalanceDoors, WeighingCaptureMode
-from robot.robot_control import URController  # Your actual robot control module
+# Run as a script, add the repository root to the path to import modules.
+# Run as a module from the repository root (python -m workflows.dosing_workflow), the path is already set.
+if not __package__:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# The balance and robot modules are imported where they are used, so that loading the workflow (e.g. for its config)
+# does not pull in the hardware libraries or connect to the robot, see _prewarm_imports
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+WORKFLOW_DIR = Path(__file__).parent
+DEFAULT_CONFIG_PATH = (WORKFLOW_DIR / "config" / "workflow_config.json").resolve()
+
+# Parsed config files by absolute path, with the mtime they were parsed at so that edits are picked up.
+# Callers get deep copies, so one workflow's changes to its config do not leak into later ones
+_CONFIG_CACHE = {}
+
+
+def _prewarm_imports():
+    """Imports the balance and robot modules, run in a thread by main() while the config is loaded."""
+    try:
+        import matterlab_balances.config
+        import robot.robot_control  # Your actual robot control module
+    except Exception:
+        # reported by initialize_hardware, which imports them again
+        logger.debug("Prewarming imports failed", exc_info=True)
+
+
+class WorkflowSettings(NamedTuple):
+    """Settings read from the workflow config, with the defaults used for missing entries."""
+    balance_ip: str = '192.168.254.83'
+    balance_password: str = 'PASSWORD'
+    robot_ip: str = '192.168.254.19'
+    gripper_port: int = 63352
+    substance_name: str = 'NaCl'
+    target_amount_mg: float = 0.5
+    wait_time_seconds: float = 2.0
+
+    @classmethod
+    def from_config(cls, config):
+        balance = config.get('balance', {})
+        robot = config.get('robot', {})
+        dosing = config.get('dosing', {})
+        return cls(
+            balance_ip=balance.get('ip', cls._field_defaults['balance_ip']),
+            balance_password=balance.get('password', cls._field_defaults['balance_password']),
+            robot_ip=robot.get('ip', cls._field_defaults['robot_ip']),
+            gripper_port=robot.get('gripper_port', cls._field_defaults['gripper_port']),
+            substance_name=dosing.get('substance_name', cls._field_defaults['substance_name']),
+            target_amount_mg=dosing.get('target_amount_mg', cls._field_defaults['target_amount_mg']),
+            wait_time_seconds=dosing.get('wait_time_seconds', cls._field_defaults['wait_time_seconds']),
+        )
 
 
 class DosingWorkflow:
     """Main workflow class for coordinating robot and balance operations."""
     
-    def __init__(self, config_path="config/workflow_config.json"):
-        """Initialize the workflow with configuration."""
+    def __init__(self, config_path=None, verbose=True):
+        """
+        Initialize the workflow with configuration, config_path is relative to the workflows directory.
+        Without verbose, the messages of successful steps are logged at DEBUG instead of INFO.
+        """
         self.config = self._load_config(config_path)
+        self._step_level = logging.INFO if verbose else logging.DEBUG
+        self.settings = WorkflowSettings.from_config(self.config)
         self.balance = None
+        # asyncio front end of self.balance for the *_async steps
+        self.async_balance = None
         self.robot = None
         self.is_initialized = False
         
     def _load_config(self, config_path):
-        """Load configuration from JSON file."""
-        config_file = Path(__file__).parent / config_path
+        """Load configuration from JSON file, parsed once per file version, returning a copy the workflow may modify."""
+        config_file = DEFAULT_CONFIG_PATH if config_path is None else (WORKFLOW_DIR / config_path).resolve()
         try:
-            with open(config_file, 'r') as f:
-                return json.load(f)
+            mtime = config_file.stat().st_mtime_ns
+            cached = _CONFIG_CACHE.get(config_file)
+            if cached is None or cached[0] != mtime:
+                cached = _CONFIG_CACHE[config_file] = (mtime, _json_loads(config_file.read_bytes()))
+            return copy.deepcopy(cached[1])
         except FileNotFoundError:
-            print(f"Config file not found: {config_file}")
+            logger.error("Config file not found: %s", config_file)
             return {}
         except json.JSONDecodeError:
-            print(f"Invalid JSON in config file: {config_file}")
+            logger.error("Invalid JSON in config file: %s", config_file)
             return {}
     
     def initialize_hardware(self):
-        """Initialize connections to balance and robot."""
+        """Initialize connections to balance and robot, returns at once if they are still connected."""
+        if self.is_initialized and self._hw_alive():
+            return True
         try:
+            from matterlab_balances.config import get_balance
+            from matterlab_balances.mt_balance import AsyncMTXPRBalance
+            from robot.robot_control import URController
+
             # Initialize balance
-            self.balance = MTXPRBalance(
-                host=self.config.get('balance', {}).get('ip', '192.168.254.83'),
-                password=self.config.get('balance', {}).get('password', 'PASSWORD')
+            # one balance session per (ip, password), shared with the other dosing scripts in the process
+            self.balance = get_balance(
+                ip=self.settings.balance_ip,
+                password=self.settings.balance_password
             )
-            print("✓ Balance connected successfully")
+            self.async_balance = AsyncMTXPRBalance(self.balance)
+            logger.log(self._step_level, "✓ Balance connected successfully")
             
             # Initialize robot
-            robot_config = self.config.get('robot', {})
-            self.robot = URController(
-                ur_ip=robot_config.get('ip', '192.168.254.19'),
-                gripper_port=robot_config.get('gripper_port', 63352)
+            # one controller, and so one robot connection, per robot IP
+            self.robot = URController.get(
+                ur_ip=self.settings.robot_ip,
+                gripper_port=self.settings.gripper_port
             )
-            print("✓ Robot connected successfully")
+            logger.log(self._step_level, "✓ Robot connected successfully")
             
             self.is_initialized = True
             return True
             
-        except Exception as e:
-            print(f"✗ Failed to initialize hardware: {e}")
+        except Exception:
+            logger.exception("✗ Failed to initialize hardware")
             return False
     
+    def _hw_alive(self):
+        """Cheap local check, without a request to either device, that the balance session and robot connection are open."""
+        rob = getattr(self.robot, 'rob', None)
+        return bool(self.balance and self.balance.is_connected() and rob is not None and rob.is_running())
+
+    def _wait_door_state(self, door, target_position, timeout=2.0, interval=0.05):
+        """Poll the door position until it reaches target_position, at most timeout seconds. Returns if it was reached."""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.balance.get_door_position(door) == target_position:
+                return True
+            if time.monotonic() >= deadline:
+                logger.warning("⚠ Door %s did not reach position %s within %s s", door.value, target_position, timeout)
+                return False
+            time.sleep(interval)
+
     def open_balance_door(self):
         """Open the right door of the balance."""
+        from matterlab_balances.mt_balance import MTXPRBalanceDoors
         try:
             self.balance.open_door(MTXPRBalanceDoors.RIGHT_OUTER)
-            print("✓ Balance right door opened")
-            time.sleep(1)  # Wait for door to fully open
+            # Wait for door to fully open, the robot must not reach in while it is still moving
+            if not self._wait_door_state(MTXPRBalanceDoors.RIGHT_OUTER, 100):
+                return False
+            logger.log(self._step_level, "✓ Balance right door opened")
             return True
-        except Exception as e:
-            print(f"✗ Failed to open balance door: {e}")
+        except Exception:
+            logger.exception("✗ Failed to open balance door")
             return False
     
     def close_balance_door(self):
         """Close the left door of the balance."""
+        from matterlab_balances.mt_balance import MTXPRBalanceDoors
         try:
             self.balance.close_door(MTXPRBalanceDoors.RIGHT_OUTER)
-            print("✓ Balance right door closed")
-            time.sleep(1)  # Wait for door to fully close
+            # Wait for door to fully close
+            if not self._wait_door_state(MTXPRBalanceDoors.RIGHT_OUTER, 0):
+                return False
+            logger.log(self._step_level, "✓ Balance right door closed")
             return True
-        except Exception as e:
-            print(f"✗ Failed to close balance door: {e}")
+        except Exception:
+            logger.exception("✗ Failed to close balance door")
             return False
     
-    def place_vial_in_balance(self):
-        """Robot places vial inside the balance."""
+    def _run_concurrent(self, *steps):
+        """Run workflow steps in parallel threads and wait for all of them. Returns False if any step failed or raised."""
+        with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+            futures = [pool.submit(step) for step in steps]
+        ok = True
+        for step, future in zip(steps, futures):
+            try:
+                ok = future.result() and ok
+            except Exception:
+                logger.exception("✗ %s failed", step.__name__)
+                ok = False
+        return ok
+
+    def pick_vial(self):
+        """Robot picks up a vial from the rack, this does not need the balance door."""
         try:
             # Use your existing waypoint sequence for vial handling
             self.robot.home_h()
             self.robot.home_h_2_vial_rack()
             self.robot.vial_rack_2_vial(release_vial=False)  # Pick up vial
-            
+            logger.log(self._step_level, "✓ Vial picked up")
+            return True
+
+        except Exception:
+            logger.exception("✗ Failed to pick up vial")
+            return False
+
+    def place_vial_in_balance(self, pick=True):
+        """Robot places vial inside the balance, picking it up first unless pick is False."""
+        if pick and not self.pick_vial():
+            return False
+        try:
             # # Move to balance and drop vial
             # self.robot.movej("home_prep_bal_h")
             # self.robot.movej("safe_bal_vial_h")
@@ -106,11 +230,11 @@ class DosingWorkflow:
             # # Move back to safe position
             # self.robot.movej("safe_bal_2_ot_h")
             
-            print("✓ Vial placed in balance")
+            logger.log(self._step_level, "✓ Vial placed in balance")
             return True
             
-        except Exception as e:
-            print(f"✗ Failed to place vial: {e}")
+        except Exception:
+            logger.exception("✗ Failed to place vial")
             return False
     
     #def place_dosing_head(self):
@@ -131,68 +255,110 @@ class DosingWorkflow:
             # self.robot.movej("dosing_head_place_h")
             # self.robot.gripper_position(self.robot.gripper_dist["open"]["dose"])
             
-            print("⚠ Dosing head placement not yet implemented - add waypoints to ur3_positions.json")
+            logger.warning("⚠ Dosing head placement not yet implemented - add waypoints to ur3_positions.json")
             return True
             
-        except Exception as e:
-            print(f"✗ Failed to place dosing head: {e}")
+        except Exception:
+            logger.exception("✗ Failed to place dosing head")
             return False
     
+    def _read_final_weight(self, timeout, interval=0.05, max_interval=0.5):
+        """Poll the weight at growing intervals until it is stable, at most timeout seconds. Returns the last reading."""
+        from matterlab_balances.mt_balance import WeighingCaptureMode
+        deadline = time.monotonic() + timeout
+        while True:
+            weight_val, unit, is_stable = self.balance.get_weight(WeighingCaptureMode.IMMEDIATE)
+            if is_stable or time.monotonic() >= deadline:
+                return weight_val, unit, is_stable
+            time.sleep(interval)
+            interval = min(interval * 1.5, max_interval)
+
+    async def _aread_final_weight(self, timeout, interval=0.05, max_interval=0.5):
+        """asyncio version of _read_final_weight."""
+        from matterlab_balances.mt_balance import WeighingCaptureMode
+        deadline = time.monotonic() + timeout
+        while True:
+            weight_val, unit, is_stable = await self.async_balance.get_weight(WeighingCaptureMode.IMMEDIATE)
+            if is_stable or time.monotonic() >= deadline:
+                return weight_val, unit, is_stable
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, max_interval)
+
     def start_dosing(self):
         """Start the dosing process."""
         try:
-            # Tare the balance
-            self.balance.tare()
-            print("✓ Balance tared")
-            
-            # Start auto dosing
-            dosing_config = self.config.get('dosing', {})
+            # Start auto dosing, smart_auto_dose closes the doors and tares the balance before its first attempt
             self.balance.smart_auto_dose(
-                substance_name=dosing_config.get('substance_name', 'NaCl'),
-                target_dose_amount_mg=dosing_config.get('target_amount_mg', 0.5)
+                substance_name=self.settings.substance_name,
+                target_dose_amount_mg=self.settings.target_amount_mg
             )
-            print("✓ Dosing started")
-            
-            # Wait for dosing to complete
-            wait_time = dosing_config.get('wait_time_seconds', 2.0)
-            time.sleep(wait_time)
+            logger.log(self._step_level, "✓ Dosing started")
             
-            # Get final weight
-            weight_val, unit, is_stable = self.balance.get_weight(WeighingCaptureMode.IMMEDIATE)
-            print(f"✓ Final weight: {weight_val} {unit}, Stable: {is_stable}")
+            # Wait for dosing to complete and get final weight
+            weight_val, unit, is_stable = self._read_final_weight(self.settings.wait_time_seconds)
+            logger.log(self._step_level, "✓ Final weight: %s %s, Stable: %s", weight_val, unit, is_stable)
             
             return True
             
-        except Exception as e:
-            print(f"✗ Failed to start dosing: {e}")
+        except Exception:
+            logger.exception("✗ Failed to start dosing")
             return False
     
     #def return_to_home(self):
         """Return robot to home position."""
         try:
             self.robot.home_h()
-            print("✓ Robot returned to home position")
+            logger.log(self._step_level, "✓ Robot returned to home position")
             return True
-        except Exception as e:
-            print(f"✗ Failed to return to home: {e}")
+        except Exception:
+            logger.exception("✗ Failed to return to home")
             return False
     
+    async def start_dosing_async(self, return_home=False, substance_name=None, target_amount_mg=None):
+        """
+        Start the dosing process on the event loop, like start_dosing.
+        With return_home, the robot returns to home position while the final weight is read.
+        The substance and amount default to those in the config.
+        """
+        try:
+            # smart_auto_dose closes the doors and tares the balance before its first attempt
+            await self.async_balance.smart_auto_dose(
+                substance_name=self.settings.substance_name if substance_name is None else substance_name,
+                target_dose_amount_mg=self.settings.target_amount_mg if target_amount_mg is None else target_amount_mg
+            )
+            logger.log(self._step_level, "✓ Dosing started")
+
+            # Wait for dosing to complete without blocking the event loop
+            read_weight = self._aread_final_weight(self.settings.wait_time_seconds)
+            if return_home:
+                (weight_val, unit, is_stable), _ = await asyncio.gather(read_weight, asyncio.to_thread(self.robot.home_h))
+                logger.log(self._step_level, "✓ Robot returned to home position")
+            else:
+                weight_val, unit, is_stable = await read_weight
+            logger.log(self._step_level, "✓ Final weight: %s %s, Stable: %s", weight_val, unit, is_stable)
+
+            return True
+
+        except Exception:
+            logger.exception("✗ Failed to start dosing")
+            return False
+
     def run_full_workflow(self):
         """Run the complete dosing workflow."""
-        print("🚀 Starting dosing workflow...")
+        logger.info("🚀 Starting dosing workflow...")
         
         if not self.is_initialized:
             if not self.initialize_hardware():
-                print("❌ Failed to initialize hardware. Aborting workflow.")
+                logger.error("❌ Failed to initialize hardware. Aborting workflow.")
                 return False
         
         try:
-            # Step 1: Open balance door
-            if not self.open_balance_door():
+            # Step 1: Open balance door while the robot picks up the vial
+            if not self._run_concurrent(self.open_balance_door, self.pick_vial):
                 return False
             
             # Step 2: Place vial in balance
-            if not self.place_vial_in_balance():
+            if not self.place_vial_in_balance(pick=False):
                 return False
             
             # Step 3: Close balance door
@@ -211,11 +377,11 @@ class DosingWorkflow:
             #if not self.return_to_home():
                 return False
             
-            print("🎉 Workflow completed successfully!")
+            logger.info("🎉 Workflow completed successfully!")
             return True
             
-        except Exception as e:
-            print(f"❌ Workflow failed with error: {e}")
+        except Exception:
+            logger.exception("❌ Workflow failed with error")
             return False
     
     #def cleanup(self):
@@ -223,21 +389,85 @@ class DosingWorkflow:
         try:
             if self.robot and hasattr(self.robot, 'rob'):
                 self.robot.rob.close()
-            print("✓ Connections closed")
-        except Exception as e:
-            print(f"✗ Error during cleanup: {e}")
+            logger.log(self._step_level, "✓ Connections closed")
+        except Exception:
+            logger.exception("✗ Error during cleanup")
+
+    async def run_full_workflow_async(self):
+        """Run the dosing workflow on an event loop, blocking robot and balance calls run in worker threads."""
+        logger.info("🚀 Starting dosing workflow...")
+
+        if not self.is_initialized:
+            if not await asyncio.to_thread(self.initialize_hardware):
+                logger.error("❌ Failed to initialize hardware. Aborting workflow.")
+                return False
+
+        try:
+            if not await self._run_vial_async():
+                return False
+
+            logger.info("🎉 Workflow completed successfully!")
+            return True
+
+        except Exception:
+            logger.exception("❌ Workflow failed with error")
+            return False
+
+    async def _run_vial_async(self, substance_name=None, target_amount_mg=None):
+        """
+        The steps for one vial, shared by the async entry points: the door opens while the robot picks up the vial,
+        the vial is placed and the door closed, then the robot returns home while the dose is weighed.
+        The substance and amount default to those in the config.
+        """
+        if not all(await asyncio.gather(asyncio.to_thread(self.open_balance_door),
+                                        asyncio.to_thread(self.pick_vial))):
+            return False
+        if not await asyncio.to_thread(self.place_vial_in_balance, False):
+            return False
+        if not await asyncio.to_thread(self.close_balance_door):
+            return False
+        return await self.start_dosing_async(return_home=True, substance_name=substance_name,
+                                             target_amount_mg=target_amount_mg)
+
+    async def run_batch_async(self, substances):
+        """
+        Dose several substances, one vial each, on the event loop.
+        The balance holds one vial at a time, so vials are dosed one after another. Within each run the door opens
+        while the robot picks up the vial, and the robot returns home while the final weight is read.
+        :param substances: list of dicts with 'substance_name' and 'target_amount_mg'
+        :return: True if all substances were dosed
+        """
+        if not self.is_initialized:
+            if not await asyncio.to_thread(self.initialize_hardware):
+                logger.error("❌ Failed to initialize hardware. Aborting batch.")
+                return False
+
+        for i, substance in enumerate(substances, 1):
+            logger.info("🚀 Dosing %s (%d/%d)...", substance['substance_name'], i, len(substances))
+            if not await self._run_vial_async(substance['substance_name'], substance['target_amount_mg']):
+                return False
+
+        logger.info("🎉 Batch of %d substances completed successfully!", len(substances))
+        return True
+
+    def run_batch(self, substances):
+        """Synchronous entry point for run_batch_async."""
+        return asyncio.run(self.run_batch_async(substances))
 
 
 def main():
     """Main function to run the workflow."""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # import the hardware modules while the config is loaded, initialize_hardware then finds them in sys.modules
+    threading.Thread(target=_prewarm_imports, daemon=True).start()
     workflow = DosingWorkflow()
     
     
     success = workflow.run_full_workflow()
     if success:
-        print("Workflow completed successfully!")
+        logger.info("Workflow completed successfully!")
     else:
-        print("Workflow failed!")
+        logger.error("Workflow failed!")
     #finally:
         #workflow.cleanup()
 
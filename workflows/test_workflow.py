@@ -2,11 +2,38 @@
 Simple test script to verify workflow setup and connections.
 """
 
+import functools
+import importlib.machinery
+import importlib.util
+import pkgutil
 import sys
 from pathlib import Path
 
-# Add parent directories to path
-sys.path.append(str(Path(__file__).parent.parent))
+# Run as a script, add the repository root to the path to import modules.
+# Run as a module from the repository root (python -m workflows.test_workflow), the path is already set.
+if not __package__:
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+CONFIG_FILE = Path(__file__).parent / "config" / "workflow_config.json"
+
+# Robot modules the workflow can use, in order of preference
+ROBOT_MODULES = ("urx_robot", "robot_control")
+
+
+@functools.lru_cache(maxsize=1)
+def _discover_robot_module():
+    """
+    Finds the first of ROBOT_MODULES in the robot package, once per process.
+    The modules are only located, not imported, since importing the robot package connects to the robot.
+    Returns (module name or None, names of all modules in the robot package).
+    """
+    package = importlib.util.find_spec("robot")
+    if package is None or not package.submodule_search_locations:
+        return None, ()
+    locations = list(package.submodule_search_locations)
+    found = next((name for name in ROBOT_MODULES if importlib.machinery.PathFinder.find_spec(name, locations)), None)
+    return found, tuple(module.name for module in pkgutil.iter_modules(locations))
+
 
 def test_imports():
     """Test if all required modules can be imported."""
@@ -21,20 +48,14 @@ def test_imports():
     
     try:
         # Try different possible robot module names
-        try:
-            from robot.urx_robot import URXRobot
-            print("✓ Robot module imported successfully (urx_robot)")
-        except ImportError:
-            try:
-                from robot.robot_control import RobotControl
-                print("✓ Robot module imported successfully (robot_control)")
-            except ImportError:
-                print("⚠ Robot module import failed - you'll need to adjust the import in dosing_workflow.py")
-                print("  Available robot modules:")
-                import robot
-                for item in dir(robot):
-                    if not item.startswith('_'):
-                        print(f"    - {item}")
+        robot_module, available = _discover_robot_module()
+        if robot_module is not None:
+            print(f"✓ Robot module found ({robot_module})")
+        else:
+            print("⚠ Robot module not found - you'll need to adjust the import in dosing_workflow.py")
+            print("  Available robot modules:")
+            for item in available:
+                print(f"    - {item}")
     except Exception as e:
         print(f"✗ Error checking robot modules: {e}")
         return False
@@ -47,7 +68,7 @@ def test_config():
     
     try:
         import json
-        config_file = Path(__file__).parent / "config" / "workflow_config.json"
+        config_file = CONFIG_FILE
         
         if config_file.exists():
             with open(config_file, 'r') as f:
@@ -77,7 +98,7 @@ def main():
         print("1. Update the robot import in dosing_workflow.py if needed")
         print("2. Update waypoints in config/workflow_config.json")
         print("3. Add gripper commands where marked with TODO")
-        print("4. Run: python workflows/dosing_workflow.py")
+        print("4. Run: python -m workflows.dosing_workflow")
     else:
         print("❌ Some tests failed. Please fix the issues above.")
     